@@ -1,4 +1,5 @@
 import os
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -22,6 +23,9 @@ def create_app() -> Flask:
     app.config["JWT_SECRET_KEY"] = os.environ.get(
         "SECRET_KEY", "default_jwt_secret_key"
     )
+    app.config["SEED_ON_STARTUP"] = os.environ.get(
+        "SEED_ON_STARTUP", "1"
+    ).lower() in ("1", "true", "yes")
     app.url_map.strict_slashes = False
     # temp. condition
     # TODO: keep only jwt
@@ -33,14 +37,47 @@ def create_app() -> Flask:
     bcrypt.init_app(app)
     CORS(app)
 
-    from .models import User
+    from .identity import load_user
 
-    @login_manager.user_loader
-    def load_user(uid: int) -> User:
-        return User.query.get(uid)
+    login_manager.user_loader(load_user)
 
     from .api_routes import register_api_routes
-    
+
     register_api_routes(app, db, bcrypt)
 
+    from .helpers import create_default_chatbots, ensure_default_chatbots
+
+    @app.cli.command("seed")
+    def seed_command() -> None:
+        """Create the default chatbots if the database has none."""
+        if create_default_chatbots(db):
+            click.echo("Default chatbots created.")
+        else:
+            click.echo("Chatbots already exist; nothing to seed.")
+
+    @app.before_request
+    def seed_default_chatbots() -> None:
+        # Only the first request of each process does any work
+        if app.config["SEED_ON_STARTUP"]:
+            ensure_default_chatbots(db)
+
+    from .constants import PREWARM_FEATURES, WARMUP_MODELS
+    from .lazy_imports import import_report, prewarm
+
+    if PREWARM_FEATURES:
+        prewarm(PREWARM_FEATURES)
+
+    @app.cli.command("import-report")
+    def import_report_command() -> None:
+        """Show how long each lazily imported module took to load."""
+        prewarm(PREWARM_FEATURES)
+        for entry in import_report():
+            seconds = f"{entry['seconds']:.3f}s" if entry["loaded"] else "not loaded"
+            click.echo(f"{entry['module']:<40} {seconds}")
+
+    if WARMUP_MODELS:
+        from .model_registry import model_registry
+
+        model_registry.warm_up(WARMUP_MODELS)
+
     return app
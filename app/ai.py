@@ -1,19 +1,32 @@
-import os
 import logging
-from groq import Groq
 from dotenv import load_dotenv
-from typing import List, Dict
-from openai import OpenAI
-import google.generativeai as genai
-from anthropic import Anthropic
-from gtts import gTTS
-import uuid
-from bs4 import BeautifulSoup
-import markdown
-from translate import Translator
-from transformers import BlipProcessor, BlipForConditionalGeneration
+from typing import Any, Callable, Dict, Iterator, List
 from PIL import Image
 import io
+import time
+from .batching import MicroBatcher
+from .constants import (
+    CAPTION_BATCH_LATENCY_MS,
+    CAPTION_BATCH_SIZE,
+    CAPTION_MODEL,
+    CAPTION_MODEL_NAME,
+    CAPTION_TIMEOUT,
+    MOCK_ENGINE_ENABLED,
+    PROVIDER_CLIENT_CACHE_SIZE,
+)
+from .lazy_imports import lazy_import
+from .metrics import HistogramFamily
+from .mock_engine import chat_with_mock, stream_mock
+from .model_registry import model_registry
+from .provider_clients import ClientCache
+from . import tts
+from .resilience import (
+    EngineUnavailableError,
+    breaker_for,
+    engine_timeout,
+    guarded_call,
+    is_caller_error,
+)
 
 load_dotenv()
 
@@ -23,23 +36,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Provider SDKs and ML libraries are slow to import; load them on first use
+groq = lazy_import("groq")
+openai = lazy_import("openai")
+anthropic = lazy_import("anthropic")
+genai = lazy_import("google.generativeai")
+genai_client = lazy_import("google.generativeai.client")
+transformers = lazy_import("transformers")
+bs4 = lazy_import("bs4")
+markdown = lazy_import("markdown")
+translate = lazy_import("translate")
 
-def generate_image_caption(image_data: bytes) -> str:
-    # Load model and processor from Hugging Face
-    processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-    model = BlipForConditionalGeneration.from_pretrained(
-        "Salesforce/blip-image-captioning-base"
+ENGINE_MODELS: Dict[str, str] = {
+    "groq": "llama3-8b-8192",
+    "openai": "gpt-3.5-turbo",
+    "anthropic": "claude-3-5-sonnet-latest",
+    "gemini": "gemini-1.5-flash",
+}
+if MOCK_ENGINE_ENABLED:
+    ENGINE_MODELS["mock"] = "mock"
+
+# Streaming latency per engine: time to first token and time to last token
+time_to_first_token = HistogramFamily()
+stream_latency = HistogramFamily()
+
+
+def load_caption_model():
+    """Load the BLIP processor and model from Hugging Face."""
+    processor = transformers.BlipProcessor.from_pretrained(CAPTION_MODEL_NAME)
+    model = transformers.BlipForConditionalGeneration.from_pretrained(
+        CAPTION_MODEL_NAME
     )
+    model.eval()
+    return processor, model
 
-    # Open image and process it
-    image = Image.open(io.BytesIO(image_data)).convert("RGB")
-    inputs = processor(images=image, return_tensors="pt")
 
-    # Generate caption
+model_registry.register(CAPTION_MODEL, load_caption_model)
+
+
+def caption_images(images: List[Image.Image]) -> List[str]:
+    """Caption a batch of RGB images with a single generate() call."""
+    processor, model = model_registry.get(CAPTION_MODEL)
+
+    inputs = processor(images=images, return_tensors="pt")
     outputs = model.generate(**inputs)
-    caption = processor.decode(outputs[0], skip_special_tokens=True)
+    return processor.batch_decode(outputs, skip_special_tokens=True)
 
-    return caption
+
+caption_batcher = MicroBatcher(
+    caption_images,
+    max_batch_size=CAPTION_BATCH_SIZE,
+    max_latency_ms=CAPTION_BATCH_LATENCY_MS,
+    name=CAPTION_MODEL,
+)
+
+
+def generate_image_caption(image_data: bytes) -> str:
+    # Open image; the batcher groups it with other in-flight requests
+    image = Image.open(io.BytesIO(image_data)).convert("RGB")
+    return caption_batcher(image, timeout=CAPTION_TIMEOUT)
+
+
+def make_gemini_model(apiKey: str) -> Any:
+    """Build a Gemini model bound to its own client instead of the global config."""
+    manager = genai_client._ClientManager()
+    manager.configure(api_key=apiKey)
+    model = genai.GenerativeModel(ENGINE_MODELS["gemini"])
+    model._client = manager.get_default_client("generative")
+    return model
+
+
+provider_clients = ClientCache(max_size=PROVIDER_CLIENT_CACHE_SIZE)
+provider_clients.register(
+    "groq",
+    lambda apiKey: groq.Groq(api_key=apiKey, timeout=engine_timeout("groq")),
+)
+provider_clients.register(
+    "openai",
+    lambda apiKey: openai.OpenAI(api_key=apiKey, timeout=engine_timeout("openai")),
+)
+provider_clients.register(
+    "anthropic",
+    lambda apiKey: anthropic.Anthropic(
+        api_key=apiKey, timeout=engine_timeout("anthropic")
+    ),
+)
+provider_clients.register("gemini", make_gemini_model)
 
 
 def chat_with_chatbot(messages: List[Dict[str, str]], apiKey: str, engine: str) -> str:
@@ -49,13 +131,23 @@ def chat_with_chatbot(messages: List[Dict[str, str]], apiKey: str, engine: str)
 
     try:
         if engine == "groq":
-            content = chat_with_groq(messages, apiKey)
+            content = guarded_call(
+                engine, lambda: chat_with_groq(messages, apiKey)
+            )
         elif engine == "openai":
-            content = chat_with_openai(messages, apiKey)
+            content = guarded_call(
+                engine, lambda: chat_with_openai(messages, apiKey)
+            )
         elif engine == "anthropic":
-            content = chat_with_anthropic(messages, apiKey)
+            content = guarded_call(
+                engine, lambda: chat_with_anthropic(messages, apiKey)
+            )
         elif engine == "gemini":
-            content = chat_with_gemini(messages, apiKey)
+            content = guarded_call(
+                engine, lambda: chat_with_gemini(messages, apiKey)
+            )
+        elif engine == "mock" and MOCK_ENGINE_ENABLED:
+            content = guarded_call(engine, lambda: chat_with_mock(messages, apiKey))
         else:
             logger.error(f"Unsupported engine: {engine}")
             raise ValueError(f"Unsupported engine: {engine}")
@@ -68,10 +160,10 @@ def chat_with_chatbot(messages: List[Dict[str, str]], apiKey: str, engine: str)
 
 def chat_with_groq(messages: List[Dict[str, str]], apiKey: str) -> str:
     try:
-        client = Groq(api_key=apiKey)
+        client = provider_clients.get("groq", apiKey)
         chat_completion = client.chat.completions.create(
             messages=messages,
-            model="llama3-8b-8192",
+            model=ENGINE_MODELS["groq"],
         )
         return chat_completion.choices[0].message.content
     except Exception as e:
@@ -81,10 +173,10 @@ def chat_with_groq(messages: List[Dict[str, str]], apiKey: str) -> str:
 
 def chat_with_openai(messages: List[Dict[str, str]], apiKey: str) -> str:
     try:
-        client = OpenAI(api_key=apiKey)
+        client = provider_clients.get("openai", apiKey)
         chat_completion = client.chat.completions.create(
             messages=messages,
-            model="gpt-3.5-turbo",
+            model=ENGINE_MODELS["openai"],
         )
         return chat_completion.choices[0].message.content
     except Exception as e:
@@ -94,11 +186,11 @@ def chat_with_openai(messages: List[Dict[str, str]], apiKey: str) -> str:
 
 def chat_with_anthropic(messages: List[Dict[str, str]], apiKey: str) -> str:
     try:
-        client = Anthropic(api_key=apiKey)
+        client = provider_clients.get("anthropic", apiKey)
         chat_completion = client.messages.create(
             max_tokens=1024,
             messages=messages,
-            model="claude-3-5-sonnet-latest",
+            model=ENGINE_MODELS["anthropic"],
         )
         return chat_completion.content
     except Exception as e:
@@ -108,50 +200,134 @@ def chat_with_anthropic(messages: List[Dict[str, str]], apiKey: str) -> str:
 
 def chat_with_gemini(messages: List[Dict[str, str]], apiKey: str) -> str:
     try:
-        genai.configure(api_key=apiKey)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        formatted_messages = [
-            {
-                "role": message["role"] if message["role"] == "user" else "model",
-                "parts": [message["content"]],
-            }
-            for message in messages
-        ]
-        response = model.generate_content(formatted_messages)
+        model = provider_clients.get("gemini", apiKey)
+        response = model.generate_content(
+            format_gemini_messages(messages),
+            request_options={"timeout": engine_timeout("gemini")},
+        )
         return response.text
     except Exception as e:
         logger.error(f"Error in chat_with_gemini: {e}")
         raise
 
 
+def format_gemini_messages(messages: List[Dict[str, str]]) -> List[Dict]:
+    return [
+        {
+            "role": message["role"] if message["role"] == "user" else "model",
+            "parts": [message["content"]],
+        }
+        for message in messages
+    ]
+
+
+def stream_chat_with_chatbot(
+    messages: List[Dict[str, str]], apiKey: str, engine: str
+) -> Iterator[str]:
+    """Yield the chatbot response piece by piece as the engine generates it."""
+    if not apiKey:
+        logger.error("API key is missing.")
+        raise ValueError("API key is required for making API requests.")
+
+    streamer = STREAMERS.get(engine)
+    if streamer is None:
+        logger.error(f"Unsupported engine: {engine}")
+        raise ValueError(f"Unsupported engine: {engine}")
+
+    breaker = breaker_for(engine)
+    if not breaker.allow():
+        raise EngineUnavailableError(f"Engine {engine} is temporarily unavailable.")
+
+    start = time.perf_counter()
+    first_token_at = None
+    try:
+        for token in streamer(messages, apiKey):
+            if first_token_at is None:
+                first_token_at = time.perf_counter() - start
+                time_to_first_token.observe(engine, first_token_at)
+            yield token
+    except Exception as e:
+        logger.error(f"Error streaming from engine {engine}: {e}")
+        if is_caller_error(e):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise
+    except BaseException:
+        # The client disconnected (GeneratorExit) before the stream finished
+        breaker.release()
+        raise
+    breaker.record_success()
+    total = time.perf_counter() - start
+    stream_latency.observe(engine, total)
+    logger.info(
+        f"Streamed {engine} response: first token after "
+        f"{(first_token_at or total):.2f}s, completed in {total:.2f}s."
+    )
+
+
+def stream_groq(messages: List[Dict[str, str]], apiKey: str) -> Iterator[str]:
+    client = provider_clients.get("groq", apiKey)
+    stream = client.chat.completions.create(
+        messages=messages, model=ENGINE_MODELS["groq"], stream=True
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def stream_openai(messages: List[Dict[str, str]], apiKey: str) -> Iterator[str]:
+    client = provider_clients.get("openai", apiKey)
+    stream = client.chat.completions.create(
+        messages=messages, model=ENGINE_MODELS["openai"], stream=True
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def stream_anthropic(messages: List[Dict[str, str]], apiKey: str) -> Iterator[str]:
+    client = provider_clients.get("anthropic", apiKey)
+    with client.messages.stream(
+        max_tokens=1024, messages=messages, model=ENGINE_MODELS["anthropic"]
+    ) as stream:
+        for text in stream.text_stream:
+            yield text
+
+
+def stream_gemini(messages: List[Dict[str, str]], apiKey: str) -> Iterator[str]:
+    model = provider_clients.get("gemini", apiKey)
+    response = model.generate_content(format_gemini_messages(messages), stream=True)
+    for chunk in response:
+        if chunk.parts:
+            yield chunk.text
+
+
+STREAMERS: Dict[str, Callable[[List[Dict[str, str]], str], Iterator[str]]] = {
+    "groq": stream_groq,
+    "openai": stream_openai,
+    "anthropic": stream_anthropic,
+    "gemini": stream_gemini,
+}
+if MOCK_ENGINE_ENABLED:
+    STREAMERS["mock"] = stream_mock
+
+
 def markdown_to_text(markdown_text: str) -> str:
     # Convert Markdown to HTML
     html = markdown.markdown(markdown_text)
     # Use BeautifulSoup to extract text
-    soup = BeautifulSoup(html, "html.parser")
+    soup = bs4.BeautifulSoup(html, "html.parser")
     return soup.get_text()
 
 
-def text_to_mp3(text: str):
-    base_path = os.path.dirname(
-        os.path.abspath(__file__)
-    )  # Get the absolute path of the script
-    temp_audio_dir = os.path.join(base_path, "temp_audio")
-    os.makedirs(temp_audio_dir, exist_ok=True)
-    plain_text = markdown_to_text(text)
-    filename = f"{uuid.uuid4()}.mp3"
-    filepath = os.path.join(temp_audio_dir, filename)
-    # print(filepath)
-
-    # Generate speech audio file
-    tts = gTTS(text=plain_text, lang="en")
-    tts.save(filepath)
-
-    return filepath
+def speech_chunks(text: str) -> List[str]:
+    """Split a (markdown) chatbot reply into sentence chunks to read aloud."""
+    return tts.split_sentences(markdown_to_text(text))
 
 
 def translate_text(text: str, target_lang: str, from_lang: str):
-    translator = Translator(to_lang=target_lang, from_lang=from_lang)
+    translator = translate.Translator(to_lang=target_lang, from_lang=from_lang)
     translated_text = translator.translate(text)
 
     return translated_text
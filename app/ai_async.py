@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
+
+from .ai import (
+    ENGINE_MODELS,
+    anthropic,
+    format_gemini_messages,
+    genai,
+    genai_client,
+    groq,
+    openai,
+)
+from .constants import (
+    ENGINE_CONCURRENCY,
+    ENGINE_FALLBACK_ORDER,
+    FALLBACK_API_KEYS,
+    MOCK_ENGINE_ENABLED,
+    PROVIDER_CLIENT_CACHE_SIZE,
+)
+from .mock_engine import achat_with_mock
+from .provider_clients import ClientCache, hash_api_key
+from .resilience import call_with_failover, engine_timeout
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """Run coroutines on one long-lived background event loop.
+
+    Async SDK clients hold connection pools bound to the loop they were
+    created on, so every provider call goes through this single loop and
+    shares its connection pools, timeouts and concurrency limits. Under WSGI
+    the request thread still waits on the returned future (Flask runs async
+    views through ``async_to_sync``), so in-flight chats are bounded by the
+    server's worker threads.
+    """
+
+    def __init__(self, name: str = "async-providers") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name=self.name, daemon=True
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+def make_async_gemini_model(apiKey: str) -> Any:
+    manager = genai_client._ClientManager()
+    manager.configure(api_key=apiKey)
+    model = genai.GenerativeModel(ENGINE_MODELS["gemini"])
+    model._async_client = manager.get_default_client("generative_async")
+    return model
+
+
+runner = AsyncRunner()
+# Concurrent identical requests share one upstream call
+in_flight_requests = SingleFlight()
+async_provider_clients = ClientCache(max_size=PROVIDER_CLIENT_CACHE_SIZE)
+async_provider_clients.register(
+    "groq",
+    lambda apiKey: groq.AsyncGroq(api_key=apiKey, timeout=engine_timeout("groq")),
+)
+async_provider_clients.register(
+    "openai",
+    lambda apiKey: openai.AsyncOpenAI(
+        api_key=apiKey, timeout=engine_timeout("openai")
+    ),
+)
+async_provider_clients.register(
+    "anthropic",
+    lambda apiKey: anthropic.AsyncAnthropic(
+        api_key=apiKey, timeout=engine_timeout("anthropic")
+    ),
+)
+async_provider_clients.register("gemini", make_async_gemini_model)
+
+# Created lazily on the runner loop; bounds in-flight calls per engine
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_in_flight: Dict[str, int] = {}
+
+
+async def achat_with_groq(messages: List[Dict[str, str]], apiKey: str) -> str:
+    client = async_provider_clients.get("groq", apiKey)
+    chat_completion = await client.chat.completions.create(
+        messages=messages,
+        model=ENGINE_MODELS["groq"],
+    )
+    return chat_completion.choices[0].message.content
+
+
+async def achat_with_openai(messages: List[Dict[str, str]], apiKey: str) -> str:
+    client = async_provider_clients.get("openai", apiKey)
+    chat_completion = await client.chat.completions.create(
+        messages=messages,
+        model=ENGINE_MODELS["openai"],
+    )
+    return chat_completion.choices[0].message.content
+
+
+async def achat_with_anthropic(messages: List[Dict[str, str]], apiKey: str) -> str:
+    client = async_provider_clients.get("anthropic", apiKey)
+    chat_completion = await client.messages.create(
+        max_tokens=1024,
+        messages=messages,
+        model=ENGINE_MODELS["anthropic"],
+    )
+    return chat_completion.content
+
+
+async def achat_with_gemini(messages: List[Dict[str, str]], apiKey: str) -> str:
+    model = async_provider_clients.get("gemini", apiKey)
+    response = await model.generate_content_async(
+        format_gemini_messages(messages),
+        request_options={"timeout": engine_timeout("gemini")},
+    )
+    return response.text
+
+
+ASYNC_ENGINES = {
+    "groq": achat_with_groq,
+    "openai": achat_with_openai,
+    "anthropic": achat_with_anthropic,
+    "gemini": achat_with_gemini,
+}
+if MOCK_ENGINE_ENABLED:
+    ASYNC_ENGINES["mock"] = achat_with_mock
+
+
+async def _call_engine(
+    messages: List[Dict[str, str]], apiKey: str, engine: str
+) -> str:
+    semaphore = _semaphores.get(engine)
+    if semaphore is None:
+        semaphore = _semaphores[engine] = asyncio.Semaphore(ENGINE_CONCURRENCY)
+    async with semaphore:
+        _in_flight[engine] = _in_flight.get(engine, 0) + 1
+        try:
+            return await ASYNC_ENGINES[engine](messages, apiKey)
+        finally:
+            _in_flight[engine] -= 1
+
+
+def fallback_engines(engine: str) -> List[Tuple[str, str]]:
+    """Deployment-configured ``(engine, api key)`` pairs to try after ``engine``."""
+    return [
+        (fallback, FALLBACK_API_KEYS[fallback])
+        for fallback in ENGINE_FALLBACK_ORDER
+        if fallback != engine
+        and fallback in ASYNC_ENGINES
+        and FALLBACK_API_KEYS.get(fallback)
+    ]
+
+
+async def _achat(messages: List[Dict[str, str]], apiKey: str, engine: str) -> str:
+    candidates = [(engine, apiKey)] + fallback_engines(engine)
+    return await call_with_failover(
+        [
+            (name, lambda name=name, key=key: _call_engine(messages, key, name))
+            for name, key in candidates
+        ]
+    )
+
+
+async def chat_with_chatbot_async(
+    messages: List[Dict[str, str]],
+    apiKey: str,
+    engine: str,
+    dedupe_key: Optional[str] = None,
+) -> str:
+    """Async counterpart of ``ai.chat_with_chatbot``; awaitable from any loop.
+
+    Calls made with the same ``dedupe_key`` and API key while one is already
+    in flight wait for that call's result instead of issuing their own.
+    Callers with different keys never share a call, so nobody is billed for,
+    or handed the auth errors of, another user's key.
+    """
+    if not apiKey:
+        logger.error("API key is missing.")
+        raise ValueError("API key is required for making API requests.")
+    if engine not in ASYNC_ENGINES:
+        logger.error(f"Unsupported engine: {engine}")
+        raise ValueError(f"Unsupported engine: {engine}")
+
+    try:
+        if dedupe_key is None:
+            future = runner.submit(_achat(messages, apiKey, engine))
+        else:
+            future, _ = in_flight_requests.submit(
+                f"{hash_api_key(apiKey)}:{dedupe_key}",
+                lambda: runner.submit(_achat(messages, apiKey, engine)),
+            )
+        content = await asyncio.wrap_future(future)
+        logger.info(f"Request to {engine} API was successful.")
+        return content
+    except Exception as e:
+        logger.error(f"Error in chat_with_chatbot_async with engine {engine}: {e}")
+        raise
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "max_concurrency_per_engine": ENGINE_CONCURRENCY,
+        "in_flight": dict(_in_flight),
+        "coalescing": in_flight_requests.stats(),
+        "clients": async_provider_clients.stats(),
+    }
@@ -1,21 +1,77 @@
-from flask import Flask, Blueprint, request, jsonify, session, Response, send_file
-from fpdf import FPDF
+from flask import (
+    Flask,
+    current_app,
+    Blueprint,
+    request,
+    jsonify,
+    session,
+    Response,
+    send_file,
+    stream_with_context,
+)
+import io
+import json
+import mimetypes
 import re
-import os
-import uuid
-from sqlalchemy import func
-from .models import User, Chatbot, Chat, Image, Comment, ChatbotVersion
+import time
+from .models import (
+    User,
+    Chatbot,
+    Chat,
+    Image,
+    Comment,
+    ChatbotVersion,
+    ConversationSummary,
+)
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
 from flask_login import login_user
-from typing import Union, List, Optional, Dict
-from .ai import chat_with_chatbot, text_to_mp3, translate_text, generate_image_caption
-from .constants import BOT_AVATAR_API, USER_AVATAR_API
-from .helpers import create_default_chatbots
-from .data_fetcher import fetch_contribution_data
+from typing import Callable, Iterator, Union, List, Optional, Dict, Tuple
+from .ai import (
+    ENGINE_MODELS,
+    caption_batcher,
+    speech_chunks,
+    translate_text,
+    generate_image_caption,
+    provider_clients,
+    stream_chat_with_chatbot,
+    stream_latency,
+    time_to_first_token,
+)
+from .ai_async import chat_with_chatbot_async
+from . import ai_async
+from .constants import (
+    BOT_AVATAR_API,
+    JOB_PRIORITIES,
+    OCR_MAX_BATCH,
+    OCR_MAX_UPLOAD_BYTES,
+    USER_AVATAR_API,
+)
+from .data_fetcher import fetch_trend_of_the_day
+from .history import load_chat_history, window_turns
+from .resilience import EngineUnavailableError
+from . import resilience, tts
+from .response_cache import response_cache
+from .summarizer import get_summary, schedule_summary_update, summary_messages
+from .lazy_imports import import_report
+from .leaderboard import leaderboard
+from .counters import counter_buffer, increment
+from .identity import load_user, user_cache
+from .ocr import (
+    OCRBusyError,
+    OCRTimeoutError,
+    UploadTooLargeError,
+    ocr_images,
+    read_upload,
+)
+from . import ocr
+from . import handwriting
+from .handwriting import render_handwriting_pdf
+from .jobs import JobLimitError, job_queue
+from .models import Job
+from .pagination import page_size, paginate_by_id
+from .model_registry import model_registry
 from datetime import datetime
 import PIL
-import pytesseract
 import re
 from flask_jwt_extended import (
     create_access_token,
@@ -28,6 +84,7 @@ from flask_jwt_extended import (
 
 ANONYMOUS_MESSAGE_LIMIT = 5
 
+
 api_bp = Blueprint("api", __name__)
 db = None
 bcrypt = None
@@ -54,9 +111,108 @@ def is_strong_password(password: str) -> bool:
 
 
 def get_current_user():
-    uid: str = get_jwt_identity()
-    user = User.query.get(uid)
-    return user
+    return load_user(get_jwt_identity())
+
+
+def award_points(user: User, points: int) -> None:
+    """Add to a user's contribution score and commit the session.
+
+    The score is incremented in SQL rather than from the loaded row, which
+    may come from the per-process user cache and be stale.
+    """
+    increment(User, user.id, "contribution_score", points)
+    user_cache.invalidate(user.id)
+    leaderboard.update(user)
+
+
+def is_stream_requested() -> bool:
+    return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def is_async_requested() -> bool:
+    return request.args.get("async", "").lower() in ("1", "true", "yes")
+
+
+def enqueue_job(
+    kind: str, params: dict, data: Optional[bytes] = None
+) -> tuple[Response, int]:
+    """Queue ``kind`` for a background worker and answer with the job id.
+
+    Clients may lower a job's priority with ``?priority=`` but not raise it
+    above the default for its kind.
+    """
+    user = get_current_user()
+    default = JOB_PRIORITIES.get(kind, 0)
+    try:
+        priority = min(int(request.args.get("priority", default)), default)
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid priority."}), 400
+    try:
+        job = job_queue.submit(kind, user.id, params, data, priority)
+    except JobLimitError as e:
+        return jsonify({"success": False, "message": str(e)}), 429
+    return jsonify({"success": True, "job": job.to_dict()}), 202
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_chat_response(
+    messages: List[Dict[str, str]],
+    apikey: str,
+    engine: str,
+    on_complete: Callable[[str], Optional[dict]],
+    cache_key: Optional[str] = None,
+) -> Response:
+    """Stream a chatbot reply as Server-Sent Events.
+
+    Each generated piece is sent as a ``token`` event. Once the engine is done,
+    ``on_complete`` receives the assembled response (e.g. to persist it) and a
+    final ``done`` event carries the full text plus time-to-first-token and
+    total latency. With a ``cache_key``, a cached reply is sent as one token.
+    """
+
+    def generate():
+        start = time.perf_counter()
+        first_token_at = None
+        parts: List[str] = []
+        try:
+            cached = response_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                tokens = [cached]
+            else:
+                tokens = stream_chat_with_chatbot(messages, apikey, engine)
+            for token in tokens:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter() - start
+                parts.append(token)
+                yield sse_event("token", {"token": token})
+            response = "".join(parts)
+            if cache_key and cached is None:
+                response_cache.set(cache_key, response)
+            extra = on_complete(response) or {}
+        except Exception as e:
+            yield sse_event("error", {"success": False, "message": str(e)})
+            return
+        total = time.perf_counter() - start
+        yield sse_event(
+            "done",
+            {
+                "success": True,
+                "response": response,
+                "time_to_first_token_ms": round((first_token_at or total) * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+                "cached": cached is not None,
+                **extra,
+            },
+        )
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @api_bp.route("/api/login", methods=["POST"])
@@ -137,6 +293,7 @@ def api_signup() -> Union[Response, tuple[Response, int]]:
     try:
         db.session.add(new_user)
         db.session.commit()
+        leaderboard.update(new_user)
         return jsonify({"success": True, "message": "User registered successfully."})
     except IntegrityError:
         db.session.rollback()
@@ -176,8 +333,7 @@ def api_create_chatbot() -> Response:
         name=chatbot_name, new_prompt=chatbot_prompt, modified_by=user.username
     )
 
-    user.contribution_score += 5
-    db.session.commit()
+    award_points(user, 5)
     return jsonify({"success": True, "message": "Chatbot created."})
 
 
@@ -202,6 +358,8 @@ def api_update_chatbot(chatbot_id: int) -> Union[Response, str]:
 
     chatbot.avatar = f"{BOT_AVATAR_API}/{new_name}"
     chatbot.category = new_category
+    if "cache_responses" in data:
+        chatbot.cache_responses = bool(data.get("cache_responses"))
     db.session.commit()
     return jsonify({"success": True, "message": "Chatbot Updated."})
 
@@ -280,7 +438,7 @@ def api_delete_chatbot(obj: str, obj_id: int) -> Union[Response, tuple[Response,
 
 @api_bp.route("/api/chatbot/<int:chatbot_id>", methods=["POST", "GET"])
 @jwt_required()
-def api_chatbot(chatbot_id: int) -> Union[Response, tuple[Response, int]]:
+async def api_chatbot(chatbot_id: int) -> Union[Response, tuple[Response, int]]:
     """API endpoint to interact with a chatbot."""
 
     chatbot: Chatbot = Chatbot.query.get_or_404(chatbot_id)
@@ -293,11 +451,10 @@ def api_chatbot(chatbot_id: int) -> Union[Response, tuple[Response, int]]:
     ):
         return jsonify({"success": False, "message": "Access denied."}), 403
 
-    chats: List[Chat] = Chat.query.filter_by(
-        chatbot_id=chatbot_id, user_id=user.id
-    ).all()
-
     if request.method == "GET":
+        chats: List[Chat] = Chat.query.filter_by(
+            chatbot_id=chatbot_id, user_id=user.id
+        ).all()
         return (
             jsonify(
                 {
@@ -313,27 +470,74 @@ def api_chatbot(chatbot_id: int) -> Union[Response, tuple[Response, int]]:
     query: str = data.get("query")
     apikey = request.headers["apikey"]
     engine = request.headers["engine"]
-    chat_to_pass: List[Dict[str, str]] = [
-        {"role": "system", "content": chatbot.latest_version.prompt}
-    ]
-    for chat in chats:
-        chat_to_pass.append({"role": "user", "content": chat.user_query})
-        chat_to_pass.append({"role": "assistant", "content": chat.response})
-    chat_to_pass.append({"role": "user", "content": query})
+    summary = get_summary(chatbot_id, user.id)
+    history = load_chat_history(
+        chatbot_id,
+        user.id,
+        [{"role": "system", "content": chatbot.latest_version.prompt}]
+        + summary_messages(summary),
+        query,
+        engine,
+        after_chat_id=summary.last_chat_id if summary else 0,
+    )
+    chat_to_pass: List[Dict[str, str]] = history.messages
+
+    def save_chat(response: str) -> dict:
+        if response:
+            chat = Chat(
+                chatbot_id=chatbot_id,
+                user_id=user.id,
+                user_query=query,
+                response=response,
+            )
+            db.session.add(chat)
+            db.session.commit()
+            schedule_summary_update(
+                current_app._get_current_object(),
+                db,
+                chatbot_id,
+                user.id,
+                engine,
+                apikey,
+            )
+        return {"dropped_turns": history.dropped_turns}
 
-    response: Optional[str] = chat_with_chatbot(chat_to_pass, apikey, engine)
+    request_key = response_cache.make_key(
+        engine,
+        ENGINE_MODELS.get(engine),
+        chatbot.latest_version_id,
+        chat_to_pass,
+    )
+    cache_key: Optional[str] = None
+    if response_cache.enabled and chatbot.cache_responses:
+        cache_key = request_key
 
-    if response:
-        chat = Chat(
-            chatbot_id=chatbot_id,
-            user_id=user.id,
-            user_query=query,
-            response=response,
+    if is_stream_requested():
+        return stream_chat_response(
+            chat_to_pass, apikey, engine, save_chat, cache_key=cache_key
         )
-        db.session.add(chat)
-        db.session.commit()
 
-        return jsonify({"success": True, "response": response})
+    response: Optional[str] = response_cache.get(cache_key) if cache_key else None
+    cached = response is not None
+    if not cached:
+        try:
+            response = await chat_with_chatbot_async(
+                chat_to_pass, apikey, engine, dedupe_key=request_key
+            )
+        except EngineUnavailableError as e:
+            return jsonify({"success": False, "message": str(e)}), 503
+        if cache_key:
+            response_cache.set(cache_key, response)
+
+    if response:
+        return jsonify(
+            {
+                "success": True,
+                "response": response,
+                "cached": cached,
+                **save_chat(response),
+            }
+        )
 
     return (
         jsonify(
@@ -373,8 +577,7 @@ def api_publish_chatbot(obj: str, obj_id: int) -> Union[Response, tuple[Response
         )
 
     item.public = not item.public
-    user.contribution_score += 2
-    db.session.commit()
+    award_points(user, 2)
 
     message: str = f"{item} is now {'published' if item.public else 'unpublished'}."
 
@@ -396,6 +599,7 @@ def api_profile_edit() -> Union[Response, tuple[Response, int]]:
     user.bio = bio
     try:
         db.session.commit()
+        leaderboard.update(user)
         return (
             jsonify({"message": "Profile updated successfully.", "success": True}),
             200,
@@ -409,7 +613,7 @@ def api_profile_edit() -> Union[Response, tuple[Response, int]]:
 
 
 @api_bp.route("/api/anonymous", methods=["POST"])
-def api_anonymous_chatbot() -> Union[Response, tuple[Response, int]]:
+async def api_anonymous_chatbot() -> Union[Response, tuple[Response, int]]:
     """API endpoint to interact with a chatbot."""
     try:
         verify_jwt_in_request(optional=True)
@@ -440,20 +644,44 @@ def api_anonymous_chatbot() -> Union[Response, tuple[Response, int]]:
     prev_chats = data.get("prev")
     query: str = data.get("query")
     apikey = request.headers["apikey"]
-    chat_to_pass: List[Dict[str, str]] = []
     engine = request.headers["engine"]
-    for chat in prev_chats:
-        chat_to_pass.append({"role": "user", "content": chat["user_query"]})
-        chat_to_pass.append({"role": "assistant", "content": chat["response"]})
-    chat_to_pass.append({"role": "user", "content": query})
+    history = window_turns(
+        [],
+        [(chat["user_query"], chat["response"]) for chat in prev_chats],
+        query,
+        engine,
+    )
+    chat_to_pass: List[Dict[str, str]] = history.messages
+
+    if is_stream_requested():
+        return stream_chat_response(
+            chat_to_pass,
+            apikey,
+            engine,
+            lambda response: {
+                "updated_chats": chat_to_pass,
+                "dropped_turns": history.dropped_turns,
+            },
+        )
 
-    response: Optional[str] = chat_with_chatbot(chat_to_pass, apikey, engine)
+    try:
+        response: Optional[str] = await chat_with_chatbot_async(
+            chat_to_pass,
+            apikey,
+            engine,
+            dedupe_key=response_cache.make_key(
+                engine, ENGINE_MODELS.get(engine), None, chat_to_pass
+            ),
+        )
+    except EngineUnavailableError as e:
+        return jsonify({"success": False, "message": str(e)}), 503
 
     return jsonify(
         {
             "success": True,
             "response": response,
             "updated_chats": chat_to_pass,
+            "dropped_turns": history.dropped_turns,
         }
     )
 
@@ -467,6 +695,10 @@ def api_clear_chats(chatbot_id: int) -> Union[Response, tuple[Response, int]]:
         chatbot_id=chatbot_id,
         user_id=user.id,
     ).delete()
+    ConversationSummary.query.filter_by(
+        chatbot_id=chatbot_id,
+        user_id=user.id,
+    ).delete()
     db.session.commit()
 
     return (
@@ -500,8 +732,7 @@ def api_create_image() -> Response:
         )
 
         db.session.add(image)
-        user.contribution_score += 5
-        db.session.commit()
+        award_points(user, 5)
         return jsonify({"success": True, "message": "Image created."})
 
 
@@ -509,8 +740,7 @@ def api_create_image() -> Response:
 @jwt_required()
 def api_user_info():
     try:
-        uid: int = get_jwt_identity()
-        user = User.query.get(uid)
+        user = get_current_user()
         if user is None:
             return jsonify({"success": False, "message": "User not found."}), 404
 
@@ -551,7 +781,6 @@ def api_get_user_data(username: str):
 @jwt_required()
 def api_get_data():
     try:
-        create_default_chatbots(db)
         uid: str = get_jwt_identity()
         queues_req: str = request.args.get("queues")
         o_uid: str = request.args.get("uid")
@@ -573,52 +802,45 @@ def api_get_data():
         }
         queues = [q for q in queues if q in valid_queues]
         response = {"success": True}
+        next_cursors: Dict[str, Optional[str]] = {}
+
+        def cursor_for(queue: str) -> Optional[str]:
+            # "after" is accepted as a shorthand when a single queue is asked for
+            return request.args.get(f"after_{queue}") or (
+                request.args.get("after") if len(queues) == 1 else None
+            )
 
-        if "system_bots" in queues:
-            system_chatbots: List[Chatbot] = (
-                Chatbot.query.options(
-                    joinedload(Chatbot.latest_version)
+        feeds = {
+            "system_bots": (
+                Chatbot,
+                Chatbot.query.filter(Chatbot.latest_version.has(modified_by="system")),
+            ),
+            "my_bots": (Chatbot, Chatbot.query.filter(Chatbot.user_id == uid)),
+            "my_images": (Image, Image.query.filter(Image.user_id == uid)),
+            "public_bots": (Chatbot, Chatbot.query.filter_by(public=True)),
+            "public_images": (Image, Image.query.filter_by(public=True)),
+            "user_bots": (Chatbot, Chatbot.query.filter(Chatbot.user_id == o_uid)),
+            "user_images": (Image, Image.query.filter(Image.user_id == o_uid)),
+        }
+        try:
+            limit = page_size(request.args.get("limit"))
+            for queue, (model, query) in feeds.items():
+                if queue not in queues:
+                    continue
+                items, next_cursors[queue] = paginate_by_id(
+                    query, model, limit, cursor_for(queue)
                 )
-                .filter(
-                    Chatbot.latest_version.has(modified_by="system")
+                response[queue] = [item.to_dict() for item in items]
+
+            if "leaderboard" in queues:
+                response["leaderboard"], next_cursors["leaderboard"] = (
+                    leaderboard.page(limit, cursor_for("leaderboard"))
                 )
-                .all()
-            )
-            response["system_bots"] = [bot.to_dict() for bot in system_chatbots]
-        if "my_bots" in queues:
-            chatbots: List[Chatbot] = Chatbot.query.filter(Chatbot.user_id == uid).all()
-            response["my_bots"] = [bot.to_dict() for bot in chatbots]
-        if "my_images" in queues:
-            images: List[Image] = Image.query.filter(Image.user_id == uid).all()
-            response["my_images"] = [image.to_dict() for image in images]
-        if "public_bots" in queues:
-            public_chatbots: List[Chatbot] = Chatbot.query.filter_by(public=True).all()
-            response["public_bots"] = [bot.to_dict() for bot in public_chatbots]
-        if "public_images" in queues:
-            public_images: List[Image] = Image.query.filter_by(public=True).all()
-            response["public_images"] = [image.to_dict() for image in public_images]
-        if "user_bots" in queues:
-            o_chatbots: List[Chatbot] = Chatbot.query.filter(
-                Chatbot.user_id == o_uid
-            ).all()
-            response["user_bots"] = [bot.to_dict() for bot in o_chatbots]
-        if "user_images" in queues:
-            o_images: List[Image] = Image.query.filter(Image.user_id == o_uid).all()
-            response["user_images"] = [image.to_dict() for image in o_images]
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
 
         if "trend_today" in queues:
-            chatbot_of_the_day: Chatbot = (
-                db.session.query(Chatbot)
-                .filter(Chatbot.public == True)
-                .order_by(func.random())
-                .first()
-            )
-            image_of_the_day: Image = (
-                db.session.query(Image)
-                .filter(Image.public == True)
-                .order_by(func.random())
-                .first()
-            )
+            chatbot_of_the_day, image_of_the_day = fetch_trend_of_the_day(db)
             response["trend_today"] = {
                 "chatbot": (
                     chatbot_of_the_day.to_dict() if chatbot_of_the_day else None
@@ -626,40 +848,71 @@ def api_get_data():
                 "image": (image_of_the_day.to_dict() if image_of_the_day else None),
             }
 
-        if "leaderboard" in queues:
-            users = fetch_contribution_data(db)
-            response["leaderboard"] = [user.to_dict() for user in users]
-
+        response["next_cursors"] = next_cursors
         return jsonify(response), 200
 
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@api_bp.route("/api/leaderboard", methods=["GET"])
+@jwt_required()
+def api_leaderboard():
+    """API endpoint to get the top K users by contribution score."""
+    try:
+        k = page_size(request.args.get("k"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "leaderboard": leaderboard.top(k)}), 200
+
+
+@api_bp.route("/api/leaderboard/rank/<int:user_id>", methods=["GET"])
+@jwt_required()
+def api_leaderboard_rank(user_id: int):
+    """API endpoint to get a user's rank on the leaderboard."""
+    entry = leaderboard.rank(user_id)
+    if entry is None:
+        return jsonify({"success": False, "message": "User not found."}), 404
+    return jsonify({"success": True, "rank": entry}), 200
+
+
+COUNTED_MODELS = {
+    "chatbot": Chatbot,
+    "image": Image,
+    "user": User,
+    "comment": Comment,
+}
+
+
+def bump_counter(obj: str, obj_id: int, column: str) -> bool:
+    """Add one to a like/report counter; False if the object does not exist.
+
+    Uses an atomic UPDATE, or the write-behind buffer when it is enabled.
+    """
+    model = COUNTED_MODELS[obj]
+    if model is User:
+        # The UPDATE bypasses the ORM, so the cached row would not see it
+        user_cache.invalidate(obj_id)
+    if not counter_buffer.enabled:
+        return increment(model, obj_id, column)
+    if db.session.query(model.id).filter_by(id=obj_id).first() is None:
+        return False
+    counter_buffer.add(model, obj_id, column)
+    return True
+
+
 @api_bp.route("/api/actions/<string:obj>/<int:obj_id>/like", methods=["POST"])
 def api_like(obj, obj_id):
     try:
-        valid_objs = {
-            "chatbot": Chatbot,
-            "image": Image,
-            "user": User,
-            "comment": Comment,
-        }
-        if obj not in valid_objs:
+        if obj not in COUNTED_MODELS:
             return jsonify({"success": False, "message": "Invalid obj"}), 400
 
-        model = valid_objs[obj]
-        item = db.session.query(model).filter_by(id=obj_id).first()
-
-        if not item:
+        if not bump_counter(obj, obj_id, "likes"):
             return (
                 jsonify({"success": False, "message": f"{obj.capitalize()} not found"}),
                 404,
             )
 
-        item.likes += 1
-
-        db.session.commit()
         return (
             jsonify(
                 {"success": True, "message": f"{obj.capitalize()} liked successfully!"}
@@ -675,27 +928,15 @@ def api_like(obj, obj_id):
 @api_bp.route("/api/actions/<string:obj>/<int:obj_id>/report", methods=["POST"])
 def api_report(obj, obj_id):
     try:
-        valid_objs = {
-            "chatbot": Chatbot,
-            "image": Image,
-            "user": User,
-            "comment": Comment,
-        }
-        if obj not in valid_objs:
+        if obj not in COUNTED_MODELS:
             return jsonify({"success": False, "message": "Invalid obj"}), 400
 
-        model = valid_objs[obj]
-        item = db.session.query(model).filter_by(id=obj_id).first()
-
-        if not item:
+        if not bump_counter(obj, obj_id, "reports"):
             return (
                 jsonify({"success": False, "message": f"{obj.capitalize()} not found"}),
                 404,
             )
 
-        item.reports += 1
-
-        db.session.commit()
         return (
             jsonify(
                 {"success": True, "message": f"{obj.capitalize()} liked successfully!"}
@@ -755,8 +996,9 @@ def api_comment_chatbot():
         db.session.add(comment)
         user = get_current_user()
         if user:
-            user.contribution_score += 3
-        db.session.commit()
+            award_points(user, 3)
+        else:
+            db.session.commit()
         return jsonify({"success": True, "message": "Comment saved"}), 200
 
     except Exception as e:
@@ -771,16 +1013,38 @@ def api_tts():
         text = data.get("text")
         if not text:
             return jsonify({"success": False, "message": "Text not found"}), 400
+        if is_async_requested():
+            return enqueue_job("tts", {"text": text})
 
-        filepath = text_to_mp3(text)
-
-        response = send_file(filepath, as_attachment=True)
-
-        @response.call_on_close
-        def remove_file():
-            os.remove(filepath)
-
-        return response
+        chunks = speech_chunks(text)
+        if not chunks:
+            return jsonify({"success": False, "message": "Text not found"}), 400
+        if len(chunks) == 1:
+            return send_file(
+                io.BytesIO(tts.synthesize(chunks[0])),
+                mimetype="audio/mpeg",
+                as_attachment=True,
+                download_name="speech.mp3",
+            )
+        # MP3 frames can be concatenated, so long replies are sent sentence
+        # by sentence and playback starts after the first one
+        stream = tts.synthesize_stream(chunks)
+        # Synthesized before the 200 is sent, so a failing engine still gets
+        # an error response instead of an empty MP3
+        first = next(stream)
+
+        def audio() -> Iterator[bytes]:
+            try:
+                yield first
+                yield from stream
+            finally:
+                stream.close()
+
+        return Response(
+            audio(),
+            mimetype="audio/mpeg",
+            headers={"Content-Disposition": "attachment; filename=speech.mp3"},
+        )
 
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
@@ -808,6 +1072,21 @@ def api_translate():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def run_ocr(files) -> Union[Response, tuple[Response, int]]:
+    try:
+        images = [read_upload(file, OCR_MAX_UPLOAD_BYTES) for file in files]
+        texts = ocr_images(images)
+    except UploadTooLargeError as e:
+        return jsonify({"success": False, "message": str(e)}), 413
+    except PIL.UnidentifiedImageError:
+        return jsonify({"success": False, "message": "Not an image file."}), 400
+    except OCRBusyError as e:
+        return jsonify({"success": False, "message": str(e)}), 503
+    except OCRTimeoutError as e:
+        return jsonify({"success": False, "message": str(e)}), 504
+    return texts
+
+
 @api_bp.route("/api/ocr", methods=["POST"])
 @jwt_required()
 def api_ocr():
@@ -815,32 +1094,59 @@ def api_ocr():
         if "file" not in request.files:
             return jsonify({"success": False, "error": "No file provided"}), 400
 
-        file = request.files["file"]
-        base_path = os.path.dirname(os.path.abspath(__file__))
-        temp_audio_dir = os.path.join(base_path, "temp_images")
-        os.makedirs(temp_audio_dir, exist_ok=True)
-        filepath = os.path.join(temp_audio_dir, file.filename)
-        file.save(filepath)
+        if is_async_requested():
+            try:
+                image = read_upload(request.files["file"], OCR_MAX_UPLOAD_BYTES)
+            except UploadTooLargeError as e:
+                return jsonify({"success": False, "message": str(e)}), 413
+            return enqueue_job("ocr", {}, image)
 
-        image = PIL.Image.open(filepath)
-        text = pytesseract.image_to_string(image)
-
-        os.remove(filepath)
-        return jsonify({"success": True, "text": text}), 200
+        result = run_ocr([request.files["file"]])
+        if not isinstance(result, list):
+            return result
+        return jsonify({"success": True, "text": result[0]}), 200
 
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
-class HandwrittenPDF(FPDF):
-    def header(self):
-        pass
+@api_bp.route("/api/ocr/batch", methods=["POST"])
+@jwt_required()
+def api_ocr_batch():
+    """OCR several images (or the pages of a document) in parallel."""
+    try:
+        files = request.files.getlist("files")
+        if not files:
+            return jsonify({"success": False, "error": "No files provided"}), 400
+        if len(files) > OCR_MAX_BATCH:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "message": f"At most {OCR_MAX_BATCH} files per batch.",
+                    }
+                ),
+                400,
+            )
 
-    def footer(self):
-        pass
+        result = run_ocr(files)
+        if not isinstance(result, list):
+            return result
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "results": [
+                        {"filename": file.filename, "text": text}
+                        for file, text in zip(files, result)
+                    ],
+                }
+            ),
+            200,
+        )
 
-    def add_custom_font(self, font_name, font_path):
-        self.add_font(font_name, "", font_path, uni=True)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
 
 
 @api_bp.route("/api/tth", methods=["POST"])
@@ -850,52 +1156,16 @@ def api_tth():
         data = request.get_json()
         text = data.get("text", "")
         font_size = data.get("font_size", 12)
-        pdf = HandwrittenPDF()
-
-        custom_font_name = "Handwritten"
-        font_path = os.path.join(os.path.dirname(__file__), "fonts", "handwriting.ttf")
-        pdf.add_custom_font(custom_font_name, font_path)
-
-        pdf.add_page()
-        pdf.set_font(custom_font_name, size=font_size)
-        pdf.set_text_color(0, 0, 255)
-
-        line_height = font_size * 0.9
-        margin = 10
-        page_width = pdf.w - 2 * margin
-        pdf.set_left_margin(margin)
-        pdf.set_right_margin(margin)
-
-        lines = text.split("\n")
-        for line in lines:
-            words = line.split()
-            current_line = ""
-            for word in words:
-                test_line = f"{current_line} {word}".strip()
-                if pdf.get_string_width(test_line) <= page_width:
-                    current_line = test_line
-                else:
-                    pdf.cell(0, line_height, current_line, ln=True)
-                    current_line = word
-            if current_line:
-                pdf.cell(0, line_height, current_line, ln=True)
-            pdf.ln(line_height * 0.2)
-
-        base_path = os.path.dirname(
-            os.path.abspath(__file__)
+        if is_async_requested():
+            return enqueue_job("tth", {"text": text, "font_size": font_size})
+
+        pdf = render_handwriting_pdf(text, font_size)
+        return send_file(
+            io.BytesIO(pdf),
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name="handwriting.pdf",
         )
-        temp_dir = os.path.join(base_path, "temp_pdfs")
-        os.makedirs(temp_dir, exist_ok=True)
-        output_path = f"{temp_dir}/{uuid.uuid4()}.pdf"
-        pdf.output(output_path)
-
-        response = send_file(output_path, as_attachment=True)
-
-        @response.call_on_close
-        def remove_file():
-            os.remove(output_path)
-
-        return response
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
@@ -912,7 +1182,105 @@ def api_image_captioning():
 
     try:
         image_data = file.read()
+        if is_async_requested():
+            return enqueue_job("caption", {}, image_data)
         caption = generate_image_caption(image_data)
         return jsonify({"success": True, "caption": caption})
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
+
+
+def json_result(value: dict) -> Tuple[bytes, str]:
+    return json.dumps(value).encode("utf-8"), "application/json"
+
+
+def tts_job(params: dict, data: Optional[bytes]) -> Tuple[bytes, str]:
+    audio = b"".join(tts.synthesize(chunk) for chunk in speech_chunks(params["text"]))
+    return audio, "audio/mpeg"
+
+
+job_queue.register("tts", tts_job)
+job_queue.register(
+    "tth",
+    lambda params, data: (
+        render_handwriting_pdf(params["text"], params["font_size"]),
+        "application/pdf",
+    ),
+)
+job_queue.register(
+    "ocr", lambda params, data: json_result({"text": ocr_images([data])[0]})
+)
+job_queue.register(
+    "caption",
+    lambda params, data: json_result({"caption": generate_image_caption(data)}),
+)
+
+
+def get_own_job(job_id: str) -> Optional[Job]:
+    job = db.session.get(Job, job_id)
+    if job is None or job.user_id != get_current_user().id:
+        return None
+    return job
+
+
+@api_bp.route("/api/jobs/<string:job_id>", methods=["GET"])
+@jwt_required()
+def api_job_status(job_id: str):
+    """API endpoint to poll the status of a background job."""
+    job = get_own_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found."}), 404
+    return jsonify({"success": True, "job": job.to_dict()}), 200
+
+
+@api_bp.route("/api/jobs/<string:job_id>/result", methods=["GET"])
+@jwt_required()
+def api_job_result(job_id: str):
+    """API endpoint to fetch the result of a finished background job."""
+    job = get_own_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found."}), 404
+    if job.status == Job.FAILED:
+        return jsonify({"success": False, "message": job.error}), 500
+    if job.status != Job.DONE:
+        return jsonify({"success": False, "job": job.to_dict()}), 409
+    if job.result_mimetype == "application/json":
+        return jsonify({"success": True, **json.loads(job.result)}), 200
+    extension = mimetypes.guess_extension(job.result_mimetype) or ""
+    return send_file(
+        io.BytesIO(job.result),
+        mimetype=job.result_mimetype,
+        as_attachment=True,
+        download_name=f"{job.kind}-{job.id}{extension}",
+    )
+
+
+@api_bp.route("/api/metrics", methods=["GET"])
+@jwt_required()
+def api_metrics():
+    """API endpoint to inspect in-process performance metrics."""
+    return (
+        jsonify(
+            {
+                "success": True,
+                "models": model_registry.stats(),
+                "batching": {caption_batcher.name: caption_batcher.stats()},
+                "provider_clients": provider_clients.stats(),
+                "async_providers": ai_async.stats(),
+                "response_cache": response_cache.stats(),
+                "engines": resilience.stats(),
+                "imports": import_report(),
+                "counters": counter_buffer.stats(),
+                "user_cache": user_cache.stats(),
+                "tts": tts.stats(),
+                "ocr": ocr.stats(),
+                "tth": handwriting.stats(),
+                "jobs": job_queue.stats(),
+                "streaming": {
+                    "time_to_first_token": time_to_first_token.snapshot(),
+                    "total": stream_latency.snapshot(),
+                },
+            }
+        ),
+        200,
+    )
@@ -0,0 +1,130 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collect concurrent single-item requests into batched calls.
+
+    Items submitted from request threads are queued; a background thread
+    waits for up to ``max_latency_ms`` after the first item (or until
+    ``max_batch_size`` items are waiting), runs ``run_batch`` once on the
+    whole batch and resolves each caller's future with its own result.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_latency_ms: float = 20,
+        name: str = "batcher",
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0, max_latency_ms) / 1000
+        self.name = name
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.last_batch_size = 0
+        self.last_batch_latency = 0.0
+        self.total_batch_latency = 0.0
+
+    def submit(self, item: Any) -> Future:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=f"{self.name}-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            pending = [
+                (item, f) for item, f in batch if f.set_running_or_notify_cancel()
+            ]
+            if not pending:
+                continue
+            start = time.perf_counter()
+            try:
+                results = list(self.run_batch([item for item, _ in pending]))
+                for (_, future), result in zip(pending, results):
+                    future.set_result(result)
+                if len(results) != len(pending):
+                    message = (
+                        f"{self.name} batch returned {len(results)} results "
+                        f"for {len(pending)} items"
+                    )
+                    logger.error(message)
+                    # Otherwise their callers would wait forever
+                    for _, future in pending[len(results) :]:
+                        future.set_exception(RuntimeError(message))
+            except Exception as e:
+                logger.error(f"Error running {self.name} batch of {len(pending)}: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+            self._record(len(pending), time.perf_counter() - start)
+
+    def _record(self, size: int, latency: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.largest_batch = max(self.largest_batch, size)
+            self.last_batch_size = size
+            self.last_batch_latency = latency
+            self.total_batch_latency += latency
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_latency_ms": self.max_latency * 1000,
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": (
+                    round(self.items / self.batches, 2) if self.batches else 0
+                ),
+                "largest_batch": self.largest_batch,
+                "last_batch_size": self.last_batch_size,
+                "last_batch_latency_s": round(self.last_batch_latency, 4),
+                "avg_batch_latency_s": (
+                    round(self.total_batch_latency / self.batches, 4)
+                    if self.batches
+                    else 0
+                ),
+            }
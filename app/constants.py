@@ -1,4 +1,5 @@
 import logging
+import os
 from typing import Union, List, Optional, Dict
 from urllib.parse import urlparse
 
@@ -8,6 +9,145 @@ logger = logging.getLogger(__name__)
 USER_AVATAR_API = "https://ui-avatars.com/api"
 BOT_AVATAR_API = "https://robohash.org"
 IMAGE_GEN_API = "https://image.pollinations.ai/prompt"
+
+CAPTION_MODEL = "image-captioning"
+CAPTION_MODEL_NAME = "Salesforce/blip-image-captioning-base"
+# Seconds a loaded model may stay unused before it is evicted (0 disables eviction)
+MODEL_IDLE_TTL = float(os.environ.get("MODEL_IDLE_TTL", "0"))
+# Concurrent caption requests are batched into one generate() call
+CAPTION_BATCH_SIZE = int(os.environ.get("CAPTION_BATCH_SIZE", "8"))
+CAPTION_BATCH_LATENCY_MS = float(os.environ.get("CAPTION_BATCH_LATENCY_MS", "25"))
+# Seconds a captioning request waits for its batch before giving up
+CAPTION_TIMEOUT = float(os.environ.get("CAPTION_TIMEOUT", "60"))
+# Number of LLM provider clients (one per engine and API key) kept alive
+PROVIDER_CLIENT_CACHE_SIZE = int(os.environ.get("PROVIDER_CLIENT_CACHE_SIZE", "256"))
+# Maximum number of in-flight async calls per LLM engine
+ENGINE_CONCURRENCY = int(os.environ.get("ENGINE_CONCURRENCY", "100"))
+# Token budget for the chat history replayed to each engine on every message
+HISTORY_TOKEN_BUDGETS: Dict[str, int] = {
+    "groq": 6000,
+    "openai": 12000,
+    "anthropic": 100000,
+    "gemini": 100000,
+}
+DEFAULT_HISTORY_TOKEN_BUDGET = 4000
+# Upper bound on the number of past turns loaded from the database
+HISTORY_MAX_TURNS = int(os.environ.get("HISTORY_MAX_TURNS", "50"))
+# Every this many turns the oldest unsummarized turns are folded into the
+# rolling conversation summary (0 disables summarization)
+SUMMARY_EVERY_TURNS = int(os.environ.get("SUMMARY_EVERY_TURNS", "10"))
+# Opt-in cache of chatbot replies for identical conversations
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+# Per-engine request timeouts in seconds, e.g. GROQ_TIMEOUT=20
+ENGINE_TIMEOUTS: Dict[str, float] = {
+    engine: float(
+        os.environ.get(
+            f"{engine.upper()}_TIMEOUT", os.environ.get("ENGINE_TIMEOUT", "60")
+        )
+    )
+    for engine in ["default", "groq", "openai", "anthropic", "gemini"]
+}
+# Engines tried, in order, when the requested one fails. Only engines with a
+# deployment API key (e.g. GROQ_API_KEY) are used as fallbacks.
+ENGINE_FALLBACK_ORDER = [
+    engine.strip()
+    for engine in os.environ.get("ENGINE_FALLBACK_ORDER", "").split(",")
+    if engine.strip()
+]
+FALLBACK_API_KEYS: Dict[str, Optional[str]] = {
+    engine: os.environ.get(f"{engine.upper()}_API_KEY")
+    for engine in ["groq", "openai", "anthropic", "gemini"]
+}
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("BREAKER_RESET_TIMEOUT", "30"))
+# Start a hedged request on the next fallback engine once the primary is slower
+# than this latency percentile (0 disables hedging)
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "0"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+# Page size of the /api/data feeds
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+# Seconds between full rebuilds of the in-memory leaderboard, which picks up
+# score changes made by other worker processes
+LEADERBOARD_REFRESH_SECONDS = float(os.environ.get("LEADERBOARD_REFRESH_SECONDS", "300"))
+# Seconds between write-behind flushes of like/report counters (0 writes
+# every click straight to the database), and the number of buffered rows
+# that forces an early flush
+COUNTER_FLUSH_INTERVAL = float(os.environ.get("COUNTER_FLUSH_INTERVAL", "0"))
+COUNTER_MAX_PENDING = int(os.environ.get("COUNTER_MAX_PENDING", "1000"))
+# Seconds a user row may be served from the process cache instead of the
+# database (0 disables it); entries are dropped when the user changes
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "0"))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+# Register the local "mock" engine (and mock speech synthesis) for
+# benchmarks; its latency before the first token, token rate and reply length
+MOCK_ENGINE_ENABLED = os.environ.get("MOCK_ENGINE_ENABLED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+MOCK_ENGINE_LATENCY_MS = float(os.environ.get("MOCK_ENGINE_LATENCY_MS", "200"))
+MOCK_ENGINE_TOKENS_PER_SECOND = float(
+    os.environ.get("MOCK_ENGINE_TOKENS_PER_SECOND", "100")
+)
+MOCK_ENGINE_REPLY_TOKENS = int(os.environ.get("MOCK_ENGINE_REPLY_TOKENS", "50"))
+# Directory and size bound of the content-addressed TTS audio cache
+TTS_CACHE_DIR = os.environ.get(
+    "TTS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache"),
+)
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Longer replies are read aloud in chunks of whole sentences of up to this
+# many characters, synthesized by this many threads
+TTS_CHUNK_CHARS = int(os.environ.get("TTS_CHUNK_CHARS", "300"))
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", "4"))
+# OCR runs in this many worker processes, with at most OCR_MAX_QUEUE images
+# queued or running; uploads are capped in size and batch length, and each
+# request must finish within OCR_TIMEOUT seconds
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", "2"))
+OCR_MAX_QUEUE = int(os.environ.get("OCR_MAX_QUEUE", "16"))
+OCR_TIMEOUT = float(os.environ.get("OCR_TIMEOUT", "30"))
+OCR_MAX_UPLOAD_BYTES = int(
+    os.environ.get("OCR_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))
+)
+OCR_MAX_BATCH = int(os.environ.get("OCR_MAX_BATCH", "10"))
+# Only the first OCR_MAX_PAGES pages of multi-page images (e.g. TIFF) are read
+OCR_MAX_PAGES = int(os.environ.get("OCR_MAX_PAGES", "10"))
+# Images are scaled towards this DPI, keeping the longest side within bounds
+OCR_TARGET_DPI = 300
+OCR_MIN_SIDE = 1000
+OCR_MAX_SIDE = 4000
+# Background jobs: worker threads started in the web process on first use
+# (set 0 when running ``python worker.py`` instead), how often idle workers
+# poll, per-user limits, seconds results are kept, and seconds after which
+# a running job is assumed lost and requeued
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1"))
+JOB_USER_CONCURRENCY = int(os.environ.get("JOB_USER_CONCURRENCY", "2"))
+JOB_USER_MAX_QUEUED = int(os.environ.get("JOB_USER_MAX_QUEUED", "20"))
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", "3600"))
+JOB_STALE_AFTER = float(os.environ.get("JOB_STALE_AFTER", "600"))
+# Highest priority each kind of job runs at; clients may only ask for less
+JOB_PRIORITIES: Dict[str, int] = {"tts": 10, "caption": 5, "ocr": 5, "tth": 0}
+# Number of rendered handwriting PDFs kept in memory for repeat requests
+TTH_CACHE_MAX_ENTRIES = int(os.environ.get("TTH_CACHE_MAX_ENTRIES", "32"))
+# Comma separated features whose libraries are imported at startup instead of
+# on first use, e.g. "groq,captioning" (see lazy_imports.FEATURES)
+PREWARM_FEATURES = [
+    name.strip()
+    for name in os.environ.get("PREWARM_FEATURES", "").split(",")
+    if name.strip()
+]
+# Comma separated model names to load while the app starts, e.g. "image-captioning"
+WARMUP_MODELS = [
+    name.strip() for name in os.environ.get("WARMUP_MODELS", "").split(",") if name.strip()
+]
 DEFAULT_CHATBOTS: List[Dict[str, Union[str, Optional[int], bool]]] = [
     {
         "name": "supportgpt",
@@ -0,0 +1,153 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy import bindparam, update
+
+from . import db
+from .constants import COUNTER_FLUSH_INTERVAL, COUNTER_MAX_PENDING
+
+logger = logging.getLogger(__name__)
+
+# (model, column, row id) -> pending delta
+CounterKey = Tuple[Any, str, int]
+
+
+def increment(model, obj_id: int, column: str, amount: int = 1) -> bool:
+    """Atomically add ``amount`` to ``column`` of one row, without reading it.
+
+    Runs a single ``UPDATE ... SET column = column + amount`` so concurrent
+    clicks are never lost. Returns False when no row has that id.
+    """
+    table = model.__table__
+    result = db.session.execute(
+        update(table)
+        .where(table.c.id == obj_id)
+        .values({column: table.c[column] + amount})
+    )
+    db.session.commit()
+    return result.rowcount > 0
+
+
+class CounterBuffer:
+    """Aggregate counter increments in memory and write them in batches.
+
+    Increments are summed per row and flushed as one batched UPDATE per
+    (model, column) at most every ``flush_interval`` seconds, or as soon as
+    ``max_pending`` rows are waiting, which bounds how stale counts can get
+    and how much a crash can lose. Pending counts are also flushed at
+    interpreter exit, and put back for the next flush if a flush fails.
+    A ``flush_interval`` of 0 disables buffering.
+    """
+
+    def __init__(self, flush_interval: float = 0, max_pending: int = 1000) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self._pending: Dict[CounterKey, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._app: Optional[Flask] = None
+        self._worker: Optional[threading.Thread] = None
+
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failed_flushes = 0
+        self.last_flush_at: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_interval > 0
+
+    def add(self, model, obj_id: int, column: str, amount: int = 1) -> None:
+        self._ensure_worker()
+        with self._lock:
+            self._pending[(model, column, obj_id)] += amount
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def pending(self, model, obj_id: int, column: str) -> int:
+        with self._lock:
+            return self._pending.get((model, column, obj_id), 0)
+
+    def flush(self) -> int:
+        """Write all pending increments; returns the number of rows updated."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+        if not pending:
+            return 0
+
+        groups: Dict[Tuple[Any, str], List[Dict[str, int]]] = defaultdict(list)
+        for (model, column, obj_id), delta in pending.items():
+            groups[(model, column)].append({"_id": obj_id, "_delta": delta})
+        try:
+            for (model, column), params in groups.items():
+                table = model.__table__
+                db.session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("_id"))
+                    .values({column: table.c[column] + bindparam("_delta")}),
+                    params,
+                )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            with self._lock:
+                for key, delta in pending.items():
+                    self._pending[key] += delta
+                self.failed_flushes += 1
+            logger.error(f"Failed to flush {len(pending)} counters: {e}")
+            return 0
+
+        with self._lock:
+            self.flushes += 1
+            self.rows_flushed += len(pending)
+            self.last_flush_at = time.time()
+        return len(pending)
+
+    def _flush_in_app(self) -> None:
+        if self._app is None:
+            return
+        with self._app.app_context():
+            self.flush()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._app = current_app._get_current_object()
+                self._worker = threading.Thread(
+                    target=self._run, name="counter-flusher", daemon=True
+                )
+                self._worker.start()
+                atexit.register(self._flush_in_app)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._flush_in_app()
+            except Exception as e:
+                logger.error(f"Counter flusher error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending_rows": len(self._pending),
+                "flushes": self.flushes,
+                "rows_flushed": self.rows_flushed,
+                "failed_flushes": self.failed_flushes,
+                "last_flush_at": self.last_flush_at,
+            }
+
+
+counter_buffer = CounterBuffer(
+    flush_interval=COUNTER_FLUSH_INTERVAL, max_pending=COUNTER_MAX_PENDING
+)
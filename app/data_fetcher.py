@@ -1,7 +1,9 @@
+import hashlib
 import logging
-from sqlalchemy import func
-from .models import User, Chatbot, Chat, Image
-from typing import Union, List, Optional, Dict
+import threading
+from datetime import date, datetime, timezone
+from .models import Chatbot, Image
+from typing import Union, Optional, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -9,13 +11,42 @@ handler = logging.FileHandler("contribution_data_fetch.log")
 handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 logger.addHandler(handler)
 
-def fetch_contribution_data(db):
-    """Fetch user data sorted by contribution score, and log details."""
+_trend_cache: Dict[str, Union[date, Optional[int]]] = {}
+_trend_lock = threading.Lock()
 
-    try:
-        users = db.session.query(User).order_by(User.contribution_score.desc()).all()
-        logger.info("Fetched user contribution data successfully.")
-        return users
-    except Exception as e:
-        logger.error(f"Error fetching contribution data: {str(e)}")
-        return []
+
+def _pick_of_the_day(db, model, day: date) -> Optional[int]:
+    """Pick one public row of ``model`` for ``day``, the same in every process."""
+    query = db.session.query(model.id).filter(model.public == True)
+    count = query.count()
+    if count == 0:
+        return None
+    digest = hashlib.sha256(f"{model.__tablename__}:{day.isoformat()}".encode())
+    index = int(digest.hexdigest(), 16) % count
+    return query.order_by(model.id).offset(index).limit(1).scalar()
+
+
+def fetch_trend_of_the_day(db) -> Tuple[Optional[Chatbot], Optional[Image]]:
+    """Return today's chatbot and image, selected once per (UTC) day."""
+    today = datetime.now(timezone.utc).date()
+    with _trend_lock:
+        if _trend_cache.get("day") != today:
+            _trend_cache.update(
+                day=today,
+                chatbot_id=_pick_of_the_day(db, Chatbot, today),
+                image_id=_pick_of_the_day(db, Image, today),
+            )
+            logger.info(f"Selected trend of the day for {today}.")
+        chatbot_id = _trend_cache["chatbot_id"]
+        image_id = _trend_cache["image_id"]
+
+    chatbot = db.session.get(Chatbot, chatbot_id) if chatbot_id else None
+    image = db.session.get(Image, image_id) if image_id else None
+    stale_chatbot = chatbot_id and (chatbot is None or not chatbot.public)
+    stale_image = image_id and (image is None or not image.public)
+    if stale_chatbot or stale_image:
+        # Deleted or unpublished since it was picked: choose again
+        with _trend_lock:
+            _trend_cache.clear()
+        return fetch_trend_of_the_day(db)
+    return chatbot, image
@@ -0,0 +1,174 @@
+import hashlib
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fpdf import FPDF
+
+from .constants import TTH_CACHE_MAX_ENTRIES
+from .response_cache import InMemoryBackend
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "fonts", "handwriting.ttf")
+FONT_NAME = "Handwritten"
+
+# (font name, path) -> parsed font entry and font file entries, as fpdf keeps them
+_fonts: Dict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = {}
+_fonts_lock = threading.Lock()
+
+
+class HandwrittenPDF(FPDF):
+    def header(self):
+        pass
+
+    def footer(self):
+        pass
+
+    def add_custom_font(self, font_name, font_path):
+        """Add a TrueType font, parsing each font file once per process."""
+        fontkey = font_name.lower()
+        with _fonts_lock:
+            cached = _fonts.get((font_name, font_path))
+            if cached is None:
+                parser = FPDF()
+                parser.add_font(font_name, "", font_path, uni=True)
+                cached = (parser.fonts[fontkey], parser.font_files)
+                _fonts[(font_name, font_path)] = cached
+        font, font_files = cached
+        # Metrics are shared; the subset of characters used is per document
+        self.fonts[fontkey] = dict(
+            font, i=len(self.fonts) + 1, subset=list(font["subset"])
+        )
+        self.font_files.update((k, dict(v)) for k, v in font_files.items())
+
+
+def width_table(font: Dict[str, Any], font_size: float) -> Callable[[str], float]:
+    """Return a memoized width function for the font, as get_string_width."""
+    char_widths = font["cw"]
+    missing = font["desc"].get("MissingWidth") or 500
+    scale = font_size / 1000.0
+    widths: Dict[str, float] = {}
+
+    def word_width(word: str) -> float:
+        width = widths.get(word)
+        if width is None:
+            units = 0
+            for code in map(ord, word):
+                units += char_widths[code] if code < len(char_widths) else missing
+            width = widths[word] = units * scale
+        return width
+
+    return word_width
+
+
+def wrap_words(
+    words: Iterable[str],
+    word_width: Callable[[str], float],
+    space_width: float,
+    max_width: float,
+) -> List[str]:
+    """Greedily pack words into lines no wider than ``max_width``.
+
+    The line width is added up word by word, so each word is measured once
+    instead of the whole line being measured again as it grows. A word wider
+    than the line gets a line of its own.
+    """
+    lines: List[str] = []
+    current: List[str] = []
+    width = 0.0
+    for word in words:
+        w = word_width(word)
+        if current and width + space_width + w <= max_width:
+            current.append(word)
+            width += space_width + w
+        else:
+            if current:
+                lines.append(" ".join(current))
+            current, width = [word], w
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+class PDFCache(InMemoryBackend):
+    """Small in-memory LRU cache of rendered PDFs; they never expire."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        super().__init__(max_entries)
+        self.enabled = max_entries > 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, font_size: Any) -> str:
+        return hashlib.sha256(f"{font_size!r}\n{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = super().get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, key: str, data: bytes, ttl: float = math.inf) -> None:
+        if self.enabled:
+            super().set(key, data, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(data) for _, data in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+pdf_cache = PDFCache(TTH_CACHE_MAX_ENTRIES)
+
+
+def _render(text: str, font_size: int) -> bytes:
+    pdf = HandwrittenPDF()
+    pdf.add_custom_font(FONT_NAME, FONT_PATH)
+
+    pdf.add_page()
+    pdf.set_font(FONT_NAME, size=font_size)
+    pdf.set_text_color(0, 0, 255)
+
+    line_height = font_size * 0.9
+    margin = 10
+    page_width = pdf.w - 2 * margin
+    pdf.set_left_margin(margin)
+    pdf.set_right_margin(margin)
+
+    word_width = width_table(pdf.current_font, pdf.font_size)
+    space_width = word_width(" ")
+    for line in text.split("\n"):
+        for row in wrap_words(line.split(), word_width, space_width, page_width):
+            pdf.cell(0, line_height, row, ln=True)
+        pdf.ln(line_height * 0.2)
+
+    # fpdf 1.x returns a latin-1 str, fpdf2 a bytearray
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+def render_handwriting_pdf(text: str, font_size: int = 12) -> bytes:
+    """Render ``text`` in the handwriting font and return the PDF bytes.
+
+    Repeated requests for the same text and size are served from
+    ``pdf_cache``.
+    """
+    key = pdf_cache.make_key(text, font_size)
+    pdf = pdf_cache.get(key)
+    if pdf is None:
+        pdf = _render(text, font_size)
+        pdf_cache.set(key, pdf)
+    return pdf
+
+
+def stats() -> Dict[str, Any]:
+    return {"fonts_loaded": len(_fonts), **pdf_cache.stats()}
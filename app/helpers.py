@@ -1,7 +1,7 @@
-from flask import flash
 from .models import Chatbot
 from .constants import BOT_AVATAR_API, DEFAULT_CHATBOTS
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -9,37 +9,65 @@ handler = logging.FileHandler("chatbot_creation.log")
 handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger.addHandler(handler)
 
+_default_chatbots_seeded = False
+_seed_lock = threading.Lock()
 
-def create_default_chatbots(db):
-    """Create default chatbots if none exist."""
+
+def _seed_default_chatbots(db) -> bool:
+    """Create default chatbots if none exist; returns True if it created them."""
+    if Chatbot.query.count() != 0:
+        return False
+    for bot_data in DEFAULT_CHATBOTS:
+        avatar = f"{BOT_AVATAR_API}/{bot_data['name']}"
+        chatbot = Chatbot(
+            public=True,
+            category="General",
+            likes=0,
+            reports=0,
+            avatar=avatar,
+            user_id=None,
+        )
+
+        db.session.add(chatbot)
+        db.session.flush()
+
+        chatbot.create_version(
+            name=bot_data["name"],
+            new_prompt=bot_data["prompt"],
+            modified_by=bot_data["generated_by"],
+        )
+
+    db.session.commit()
+    logger.info("Default chatbots and their initial versions created successfully.")
+    return True
+
+
+def create_default_chatbots(db) -> bool:
+    """Create default chatbots if none exist; returns True if it created them."""
     try:
-        if Chatbot.query.count() == 0:
-            for bot_data in DEFAULT_CHATBOTS:
-                avatar = f"{BOT_AVATAR_API}/{bot_data['name']}"
-                chatbot = Chatbot(
-                    public=True,
-                    category="General",
-                    likes=0,
-                    reports=0,
-                    avatar=avatar,
-                    user_id=None,
-                )
-
-                db.session.add(chatbot)
-                db.session.flush()
-
-                chatbot.create_version(
-                    name=bot_data["name"],
-                    new_prompt=bot_data["prompt"],
-                    modified_by=bot_data["generated_by"],
-                )
-
-            db.session.commit()
-            logger.info(
-                "Default chatbots and their initial versions created successfully."
-            )
+        return _seed_default_chatbots(db)
     except Exception as e:
         db.session.rollback()
         error_message = f"Error creating default chatbots: {str(e)}"
-        flash(error_message, "error")
         logger.error(error_message)
+    return False
+
+
+def ensure_default_chatbots(db) -> None:
+    """Seed default chatbots at most once per process.
+
+    A failed attempt (e.g. the tables do not exist yet) is retried on the
+    next call.
+    """
+    global _default_chatbots_seeded
+    if _default_chatbots_seeded:
+        return
+    with _seed_lock:
+        if not _default_chatbots_seeded:
+            try:
+                _seed_default_chatbots(db)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error creating default chatbots: {str(e)}")
+                return
+            _default_chatbots_seeded = True
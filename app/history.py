@@ -0,0 +1,157 @@
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .constants import (
+    DEFAULT_HISTORY_TOKEN_BUDGET,
+    HISTORY_MAX_TURNS,
+    HISTORY_TOKEN_BUDGETS,
+)
+from .lazy_imports import lazy_import
+from .models import Chat
+
+logger = logging.getLogger(__name__)
+
+tiktoken = lazy_import("tiktoken")
+
+# Loaded on first use: get_encoding may download the BPE file
+_encoding: Any = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# (user_query, response) pairs
+Turn = Tuple[str, str]
+
+
+class HistoryWindow(NamedTuple):
+    messages: List[Dict[str, str]]
+    kept_turns: int
+    dropped_turns: int
+    tokens: int
+
+
+def _get_encoding() -> Any:
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # Fall back to a character estimate
+                    logger.warning(f"tiktoken unavailable, estimating tokens: {e}")
+                _encoding_loaded = True
+    return _encoding
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimate how many tokens ``text`` costs in a provider request."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def token_budget(engine: str) -> int:
+    return HISTORY_TOKEN_BUDGETS.get(engine, DEFAULT_HISTORY_TOKEN_BUDGET)
+
+
+def fit_turns(turns: Sequence[Turn], budget: int) -> Tuple[int, int]:
+    """Count how many of ``turns`` (newest first) fit in ``budget`` tokens.
+
+    Returns the number of turns kept and the tokens they use.
+    """
+    used = 0
+    kept = 0
+    for user_query, response in turns:
+        cost = estimate_tokens(user_query) + estimate_tokens(response)
+        if used + cost > budget:
+            break
+        used += cost
+        kept += 1
+    return kept, used
+
+
+def build_messages(
+    system_messages: List[Dict[str, str]], turns: Sequence[Turn], query: str
+) -> List[Dict[str, str]]:
+    """Assemble the provider payload from turns given oldest first."""
+    messages = list(system_messages)
+    for user_query, response in turns:
+        messages.append({"role": "user", "content": user_query})
+        messages.append({"role": "assistant", "content": response})
+    messages.append({"role": "user", "content": query})
+    return messages
+
+
+def window_turns(
+    system_messages: List[Dict[str, str]],
+    turns: Sequence[Turn],
+    query: str,
+    engine: str,
+) -> HistoryWindow:
+    """Fit client-supplied turns (oldest first) into the engine's budget."""
+    fixed = estimate_tokens(query) + sum(
+        estimate_tokens(message["content"]) for message in system_messages
+    )
+    newest_first = list(reversed(turns[-HISTORY_MAX_TURNS:]))
+    kept, used = fit_turns(newest_first, token_budget(engine) - fixed)
+    kept_turns = list(reversed(newest_first[:kept]))
+    return HistoryWindow(
+        messages=build_messages(system_messages, kept_turns, query),
+        kept_turns=kept,
+        dropped_turns=len(turns) - kept,
+        tokens=fixed + used,
+    )
+
+
+def load_chat_history(
+    chatbot_id: int,
+    user_id: int,
+    system_messages: List[Dict[str, str]],
+    query: str,
+    engine: str,
+    after_chat_id: int = 0,
+) -> HistoryWindow:
+    """Load only the most recent chats that fit the engine's token budget.
+
+    Rows are read newest first with a LIMIT, so the cost of a message no
+    longer grows with the length of the whole conversation. Chats up to
+    ``after_chat_id`` are skipped because a summary already covers them.
+    """
+    fixed = estimate_tokens(query) + sum(
+        estimate_tokens(message["content"]) for message in system_messages
+    )
+    base_query = Chat.query.filter(
+        Chat.chatbot_id == chatbot_id,
+        Chat.user_id == user_id,
+        Chat.id > after_chat_id,
+    )
+    rows: List[Chat] = (
+        base_query.order_by(Chat.id.desc()).limit(HISTORY_MAX_TURNS).all()
+    )
+    kept, used = fit_turns(
+        [(chat.user_query, chat.response) for chat in rows],
+        token_budget(engine) - fixed,
+    )
+    total = len(rows) if len(rows) < HISTORY_MAX_TURNS else base_query.count()
+    dropped = total - kept
+    if dropped:
+        logger.info(
+            f"Dropped {dropped} of {total} turns for chatbot {chatbot_id} "
+            f"to fit the {engine} history budget."
+        )
+    kept_rows = reversed(rows[:kept])
+    return HistoryWindow(
+        messages=build_messages(
+            system_messages,
+            [(chat.user_query, chat.response) for chat in kept_rows],
+            query,
+        ),
+        kept_turns=kept,
+        dropped_turns=dropped,
+        tokens=fixed + used,
+    )
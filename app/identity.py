@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from . import db
+from .constants import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL
+from .models import User
+
+
+class UserCache:
+    """Short-lived process cache of user rows keyed by id.
+
+    Stores plain column values, not ORM instances, so entries can be shared
+    across threads and sessions; ``attach`` turns one back into a persistent
+    ``User`` in the current session without a SELECT. Entries are dropped
+    whenever a user is flushed as changed or deleted. A ``ttl`` of 0
+    disables the cache.
+    """
+
+    def __init__(self, ttl: float = 0, max_entries: int = 10000) -> None:
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user: User) -> None:
+        values = {
+            attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs
+        }
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+user_cache = UserCache(ttl=USER_CACHE_TTL, max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+def attach(values: Dict[str, Any]) -> User:
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def load_user(user_id: Union[int, str, None]) -> Optional[User]:
+    """Look a user up at most once per request, using the process cache."""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    request_users: Dict[int, Optional[User]] = {}
+    if has_app_context():
+        request_users = g.setdefault("_identity_users", {})
+        if user_id in request_users:
+            user = request_users[user_id]
+            # Only reuse it while the session it was loaded in is still open
+            if user is None or user in db.session:
+                return user
+
+    values = user_cache.get(user_id) if user_cache.enabled else None
+    if values is not None:
+        user = attach(values)
+    else:
+        user = db.session.get(User, user_id)
+        if user is not None and user_cache.enabled:
+            user_cache.put(user)
+    request_users[user_id] = user
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_users(session, flush_context) -> None:
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            user_cache.invalidate(obj.id)
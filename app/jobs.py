@@ -0,0 +1,277 @@
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy import func, select, update
+
+from . import db
+from .constants import (
+    JOB_POLL_INTERVAL,
+    JOB_RESULT_TTL,
+    JOB_STALE_AFTER,
+    JOB_USER_CONCURRENCY,
+    JOB_USER_MAX_QUEUED,
+    JOB_WORKERS,
+)
+from .metrics import HistogramFamily
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# (params, binary input) -> (result bytes, result mimetype)
+JobHandler = Callable[[Dict[str, Any], Optional[bytes]], Tuple[bytes, str]]
+
+
+class JobLimitError(RuntimeError):
+    """Raised when a user already has too many jobs queued or running."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobQueue:
+    """Database-backed queue of background jobs, run by local worker threads.
+
+    Jobs live in the ``jobs`` table, so any process sharing the database
+    (the web app or ``python worker.py``) can run them and no broker is
+    needed. Workers take the highest priority, oldest job whose owner has
+    fewer than ``user_concurrency`` jobs running. Results are kept for
+    ``result_ttl`` seconds after a job finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        user_concurrency: int = 2,
+        user_max_queued: int = 20,
+        result_ttl: float = 3600,
+        stale_after: float = 600,
+    ) -> None:
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.user_concurrency = user_concurrency
+        self.user_max_queued = user_max_queued
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after
+        self._handlers: Dict[str, JobHandler] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_cleanup = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.run_time = HistogramFamily()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def submit(
+        self,
+        kind: str,
+        user_id: int,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        priority: int = 0,
+    ) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        active = (
+            db.session.query(func.count(Job.id))
+            .filter(
+                Job.user_id == user_id, Job.status.in_([Job.QUEUED, Job.RUNNING])
+            )
+            .scalar()
+        )
+        if active >= self.user_max_queued:
+            raise JobLimitError(
+                f"You already have {active} jobs pending; wait for some to finish."
+            )
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            user_id=user_id,
+            priority=priority,
+            status=Job.QUEUED,
+            params=json.dumps(params or {}),
+            input=data,
+            created_at=_now(),
+        )
+        db.session.add(job)
+        db.session.commit()
+        self._ensure_workers()
+        self._wake.set()
+        return job
+
+    def claim(self) -> Optional[str]:
+        """Mark the next runnable job as running and return its id."""
+        busy_users = (
+            select(Job.user_id)
+            .where(Job.status == Job.RUNNING)
+            .group_by(Job.user_id)
+            .having(func.count(Job.id) >= self.user_concurrency)
+        )
+        candidates = db.session.execute(
+            select(Job.id)
+            .where(Job.status == Job.QUEUED, Job.user_id.not_in(busy_users))
+            .order_by(Job.priority.desc(), Job.created_at, Job.id)
+            .limit(self.workers + 1)
+        ).scalars()
+        for job_id in candidates:
+            # Another worker may have taken it since the SELECT
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == Job.QUEUED)
+                .values(status=Job.RUNNING, started_at=_now())
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return job_id
+        db.session.commit()
+        return None
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False when there was nothing to run."""
+        job_id = self.claim()
+        if job_id is None:
+            return False
+        job = db.session.get(Job, job_id)
+        kind, params, data = job.kind, json.loads(job.params), job.input
+        db.session.commit()
+
+        start = time.perf_counter()
+        try:
+            result, mimetype = self._handlers[kind](params, data)
+        except Exception as e:
+            logger.error(f"Job {job_id} ({kind}) failed: {e}")
+            self._finish(job_id, Job.FAILED, error=str(e))
+            self.failed += 1
+        else:
+            self._finish(job_id, Job.DONE, result=result, mimetype=mimetype)
+            self.completed += 1
+        self.run_time.observe(kind, time.perf_counter() - start)
+        return True
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[bytes] = None,
+        mimetype: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        now = _now()
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=status,
+                result=result,
+                result_mimetype=mimetype,
+                error=error,
+                # The input is no longer needed once the job has run
+                input=None,
+                finished_at=now,
+                expires_at=now + timedelta(seconds=self.result_ttl),
+            )
+        )
+        db.session.commit()
+
+    def cleanup(self) -> None:
+        """Delete expired results and requeue jobs whose worker died."""
+        now = _now()
+        deleted = (
+            db.session.query(Job)
+            .filter(Job.expires_at < now)
+            .delete(synchronize_session=False)
+        )
+        requeued = (
+            db.session.query(Job)
+            .filter(
+                Job.status == Job.RUNNING,
+                Job.started_at < now - timedelta(seconds=self.stale_after),
+            )
+            .update({"status": Job.QUEUED, "started_at": None}, synchronize_session=False)
+        )
+        db.session.commit()
+        if deleted or requeued:
+            logger.info(f"Deleted {deleted} expired jobs, requeued {requeued} stale.")
+
+    def work(self, app: Flask, stop: Optional[threading.Event] = None) -> None:
+        """Worker loop: run jobs as they come, cleaning up now and then."""
+        while stop is None or not stop.is_set():
+            with app.app_context():
+                try:
+                    if time.monotonic() - self._last_cleanup > self.poll_interval * 60:
+                        self._last_cleanup = time.monotonic()
+                        self.cleanup()
+                    ran = self.run_once()
+                except Exception as e:
+                    logger.error(f"Job worker error: {e}")
+                    db.session.rollback()
+                    ran = False
+                finally:
+                    db.session.remove()
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def start(
+        self, app: Flask, workers: Optional[int] = None
+    ) -> List[threading.Thread]:
+        """Start ``workers`` (default ``self.workers``) daemon worker threads.
+
+        Does nothing if this process already runs workers.
+        """
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers if workers is None else workers):
+                    thread = threading.Thread(
+                        target=self.work,
+                        args=(app,),
+                        name=f"job-worker-{i}",
+                        daemon=True,
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+            return list(self._threads)
+
+    def _ensure_workers(self) -> None:
+        if self._threads or self.workers <= 0:
+            return
+        # Pool children (e.g. spawned OCR workers) never run jobs themselves
+        if multiprocessing.parent_process() is not None:
+            return
+        self.start(current_app._get_current_object())
+
+    def stats(self) -> Dict[str, Any]:
+        depth: Dict[str, Dict[str, int]] = {}
+        rows = db.session.query(Job.kind, Job.status, func.count(Job.id)).group_by(
+            Job.kind, Job.status
+        )
+        for kind, status, count in rows:
+            depth.setdefault(kind, {})[status] = count
+        return {
+            "in_process_workers": len(self._threads),
+            "depth": depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "run_time": self.run_time.snapshot(),
+        }
+
+
+job_queue = JobQueue(
+    workers=JOB_WORKERS,
+    poll_interval=JOB_POLL_INTERVAL,
+    user_concurrency=JOB_USER_CONCURRENCY,
+    user_max_queued=JOB_USER_MAX_QUEUED,
+    result_ttl=JOB_RESULT_TTL,
+    stale_after=JOB_STALE_AFTER,
+)
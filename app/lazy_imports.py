@@ -0,0 +1,92 @@
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Feature name -> heavy modules it needs; used to pre-warm selected features
+FEATURES: Dict[str, List[str]] = {
+    "groq": ["groq"],
+    "openai": ["openai"],
+    "anthropic": ["anthropic"],
+    "gemini": ["google.generativeai", "google.generativeai.client"],
+    "captioning": ["transformers"],
+    "tts": ["gtts", "markdown", "bs4"],
+    "translate": ["translate"],
+    "ocr": ["pytesseract"],
+    "tokens": ["tiktoken"],
+}
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = _import_timed(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+_lazy_modules: Dict[str, LazyModule] = {}
+_import_times: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def _import_timed(name: str) -> ModuleType:
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        if name not in _import_times:
+            _import_times[name] = elapsed
+            logger.info(f"Imported {name} in {elapsed:.3f}s")
+    return module
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module ``name`` that imports it on first use."""
+    with _lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+    return module
+
+
+def prewarm(features: Iterable[str]) -> None:
+    """Import the modules behind ``features`` now instead of on first use."""
+    for feature in features:
+        modules = FEATURES.get(feature)
+        if modules is None:
+            logger.error(f"Unknown feature to pre-warm: {feature}")
+            continue
+        for name in modules:
+            try:
+                lazy_import(name)._load()
+            except ImportError as e:
+                logger.error(f"Failed to pre-warm {feature} ({name}): {e}")
+
+
+def import_report() -> List[Dict[str, object]]:
+    """Import cost of every lazily loaded module, slowest first."""
+    with _lock:
+        loaded = dict(_import_times)
+        pending = [name for name in _lazy_modules if name not in loaded]
+    report = [
+        {"module": name, "loaded": True, "seconds": round(seconds, 4)}
+        for name, seconds in sorted(loaded.items(), key=lambda item: -item[1])
+    ]
+    report += [{"module": name, "loaded": False, "seconds": None} for name in pending]
+    return report
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from . import db
+from .constants import LEADERBOARD_REFRESH_SECONDS
+from .models import User
+from .pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Sorted ascending, so the highest score (and newest id on ties) comes first
+RankKey = Tuple[int, int]
+
+
+def rank_key(score: int, user_id: int) -> RankKey:
+    return (-score, -user_id)
+
+
+class Leaderboard:
+    """In-memory ranking of users by contribution score.
+
+    Built from the database on first use and refreshed every
+    ``refresh_interval`` seconds (so that other workers' updates show up),
+    and kept current in between by ``update`` whenever a score changes.
+    Top-K reads and rank lookups never touch the database.
+    """
+
+    def __init__(self, refresh_interval: float = 300) -> None:
+        self.refresh_interval = refresh_interval
+        self._keys: List[RankKey] = []
+        self._entries: Dict[int, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def rebuild(self) -> None:
+        rows = db.session.query(
+            User.id, User.name, User.username, User.avatar, User.contribution_score
+        ).all()
+        entries = {
+            row.id: {
+                "id": row.id,
+                "name": row.name,
+                "username": row.username,
+                "avatar": row.avatar,
+                "contribution_score": row.contribution_score,
+            }
+            for row in rows
+        }
+        keys = sorted(
+            rank_key(entry["contribution_score"], user_id)
+            for user_id, entry in entries.items()
+        )
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+        logger.info(f"Rebuilt leaderboard with {len(entries)} users.")
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_interval:
+            self.rebuild()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def update(self, user: User) -> None:
+        """Record a user's current score and profile; call after committing."""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # picked up by the next rebuild
+            old = self._entries.get(user.id)
+            if old is not None:
+                index = bisect_left(
+                    self._keys, rank_key(old["contribution_score"], user.id)
+                )
+                del self._keys[index]
+            self._entries[user.id] = {
+                "id": user.id,
+                "name": user.name,
+                "username": user.username,
+                "avatar": user.avatar,
+                "contribution_score": user.contribution_score,
+            }
+            insort(self._keys, rank_key(user.contribution_score, user.id))
+
+    def _entry_at(self, index: int) -> dict:
+        _, negative_id = self._keys[index]
+        return {**self._entries[-negative_id], "rank": index + 1}
+
+    def top(self, k: int) -> List[dict]:
+        self._ensure_loaded()
+        with self._lock:
+            return [self._entry_at(i) for i in range(min(k, len(self._keys)))]
+
+    def rank(self, user_id: int) -> Optional[dict]:
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            index = bisect_left(
+                self._keys, rank_key(entry["contribution_score"], user_id)
+            )
+            return {**self._entry_at(index), "total": len(self._keys)}
+
+    def page(
+        self, limit: int, after: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of the ranking, using the same cursors as the DB feeds."""
+        self._ensure_loaded()
+        with self._lock:
+            start = 0
+            if after:
+                last_score, last_id = decode_cursor(after)
+                start = bisect_right(self._keys, rank_key(last_score, last_id))
+            end = min(start + limit, len(self._keys))
+            entries = [self._entry_at(i) for i in range(start, end)]
+            has_more = end < len(self._keys)
+        next_cursor = None
+        if has_more and entries:
+            last = entries[-1]
+            next_cursor = encode_cursor(last["contribution_score"], last["id"])
+        return entries, next_cursor
+
+
+leaderboard = Leaderboard(refresh_interval=LEADERBOARD_REFRESH_SECONDS)
@@ -0,0 +1,81 @@
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+# Upper bounds (in milliseconds) of the histogram buckets
+DEFAULT_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class LatencyHistogram:
+    """Bucketed latency histogram that also keeps a window of recent samples.
+
+    Buckets give a cheap cumulative view; the sample window is used to answer
+    percentile queries such as p50/p95/p99.
+    """
+
+    def __init__(
+        self, buckets_ms: Optional[List[float]] = None, window: int = 1024
+    ) -> None:
+        self.buckets_ms = buckets_ms or DEFAULT_BUCKETS_MS
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect_left(self.buckets_ms, ms)] += 1
+            self.samples.append(ms)
+            self.count += 1
+            self.total += ms
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the ``pct`` percentile (0-100) of recent samples in ms."""
+        with self._lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, object]:
+        buckets = {
+            f"le_{bound:g}ms": count
+            for bound, count in zip(self.buckets_ms, self.counts)
+        }
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+class HistogramFamily:
+    """A set of latency histograms keyed by a label such as the engine name."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def get(self, label: str) -> LatencyHistogram:
+        histogram = self._histograms.get(label)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(label, LatencyHistogram())
+        return histogram
+
+    def observe(self, label: str, seconds: float) -> None:
+        self.get(label).observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {
+            label: histogram.snapshot()
+            for label, histogram in list(self._histograms.items())
+        }
@@ -0,0 +1,51 @@
+import asyncio
+import time
+from typing import Dict, Iterator, List
+
+from .constants import (
+    MOCK_ENGINE_LATENCY_MS,
+    MOCK_ENGINE_REPLY_TOKENS,
+    MOCK_ENGINE_TOKENS_PER_SECOND,
+)
+
+# A local stand-in for the LLM providers, for benchmarks and load tests. It is
+# only registered as the "mock" engine when MOCK_ENGINE_ENABLED is set.
+
+
+def _reply_tokens(messages: List[Dict[str, str]]) -> List[str]:
+    words = (messages[-1]["content"].split() if messages else []) or ["ok"]
+    return [f"{words[i % len(words)]} " for i in range(MOCK_ENGINE_REPLY_TOKENS)]
+
+
+def _token_delay() -> float:
+    if MOCK_ENGINE_TOKENS_PER_SECOND <= 0:
+        return 0
+    return 1 / MOCK_ENGINE_TOKENS_PER_SECOND
+
+
+def chat_with_mock(messages: List[Dict[str, str]], apiKey: str) -> str:
+    tokens = _reply_tokens(messages)
+    time.sleep(MOCK_ENGINE_LATENCY_MS / 1000 + _token_delay() * len(tokens))
+    return "".join(tokens).strip()
+
+
+async def achat_with_mock(messages: List[Dict[str, str]], apiKey: str) -> str:
+    tokens = _reply_tokens(messages)
+    await asyncio.sleep(MOCK_ENGINE_LATENCY_MS / 1000 + _token_delay() * len(tokens))
+    return "".join(tokens).strip()
+
+
+def stream_mock(messages: List[Dict[str, str]], apiKey: str) -> Iterator[str]:
+    time.sleep(MOCK_ENGINE_LATENCY_MS / 1000)
+    delay = _token_delay()
+    for token in _reply_tokens(messages):
+        if delay:
+            time.sleep(delay)
+        yield token
+
+
+def synthesize_mock_speech(text: str) -> bytes:
+    """Silent MP3-sized payload standing in for gTTS, after the same latency."""
+    time.sleep(MOCK_ENGINE_LATENCY_MS / 1000)
+    # Roughly the size of real speech at gTTS's bitrate: ~1 KB per word
+    return b"\xff\xfb\x90\x00" * (256 * max(1, len(text.split())))
@@ -0,0 +1,140 @@
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .constants import MODEL_IDLE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(obj: Any) -> int:
+    """Best-effort estimate of the memory held by a loaded model object."""
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in obj)
+    if hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+        # torch.nn.Module: count parameter and buffer storage
+        tensors = list(obj.parameters()) + list(obj.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    return sys.getsizeof(obj)
+
+
+class _Entry:
+    def __init__(self, value: Any, load_time: float) -> None:
+        self.value = value
+        self.load_time = load_time
+        self.loaded_at = time.monotonic()
+        self.last_used = self.loaded_at
+        self.nbytes = estimate_nbytes(value)
+
+
+class ModelRegistry:
+    """Process-wide, lazily populated store of expensive-to-load models.
+
+    Each model is loaded at most once per process, on first use or through
+    ``warm_up``. Models that stay unused for longer than ``idle_ttl`` seconds
+    are dropped so that idle workers give the memory back.
+    """
+
+    def __init__(self, idle_ttl: float = 0) -> None:
+        self.idle_ttl = idle_ttl
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str) -> Any:
+        """Return the model registered as ``name``, loading it if needed."""
+        entry = self._entries.get(name)
+        if entry is None:
+            if name not in self._loaders:
+                raise KeyError(f"No model registered as '{name}'")
+            with self._load_locks[name]:
+                entry = self._entries.get(name)
+                if entry is None:
+                    entry = self._load(name)
+        entry.last_used = time.monotonic()
+        return entry.value
+
+    def _load(self, name: str) -> _Entry:
+        start = time.perf_counter()
+        value = self._loaders[name]()
+        entry = _Entry(value, time.perf_counter() - start)
+        with self._lock:
+            self._entries[name] = entry
+        logger.info(
+            f"Loaded model '{name}' in {entry.load_time:.2f}s "
+            f"(~{entry.nbytes / (1024 * 1024):.1f} MiB)"
+        )
+        self._ensure_reaper()
+        return entry
+
+    def warm_up(self, names: Iterable[str]) -> None:
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to warm up model '{name}': {e}")
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(name, None)
+        if entry is not None:
+            logger.info(f"Evicted model '{name}'")
+        return entry is not None
+
+    def evict_idle(self) -> List[str]:
+        """Drop every model that has been idle for longer than ``idle_ttl``."""
+        if self.idle_ttl <= 0:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                name
+                for name, entry in self._entries.items()
+                if now - entry.last_used > self.idle_ttl
+            ]
+        return [name for name in idle if self.evict(name)]
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_ttl <= 0 or self._reaper is not None:
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_forever, name="model-registry-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def _reap_forever(self) -> None:
+        interval = max(self.idle_ttl / 2, 1)
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+
+    def stats(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        stats = {}
+        for name in list(self._loaders):
+            entry = self._entries.get(name)
+            stats[name] = {
+                "loaded": entry is not None,
+                "load_time_s": round(entry.load_time, 3) if entry else None,
+                "memory_bytes": entry.nbytes if entry else None,
+                "idle_s": round(now - entry.last_used, 1) if entry else None,
+            }
+        return stats
+
+
+model_registry = ModelRegistry(idle_ttl=MODEL_IDLE_TTL)
@@ -20,7 +20,9 @@ class User(db.Model, UserMixin):
         db.DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    contribution_score: int = db.Column(db.Integer, default=0, nullable=False)
+    contribution_score: int = db.Column(
+        db.Integer, default=0, nullable=False, index=True
+    )
 
     def __repr__(self) -> str:
         return f"<User: {self.username}>"
@@ -42,6 +44,11 @@ class User(db.Model, UserMixin):
 
 class Chatbot(db.Model):
     __tablename__ = "chatbots"
+    # Feeds filter on owner or visibility and page newest first by id
+    __table_args__ = (
+        db.Index("ix_chatbots_user_id_id", "user_id", "id"),
+        db.Index("ix_chatbots_public_id", "public", "id"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     avatar: str = db.Column(db.Text, nullable=False)
@@ -50,12 +57,19 @@ class Chatbot(db.Model):
     category = db.Column(db.Text, default="General", nullable=False)
     likes: int = db.Column(db.Integer, default=0, nullable=False)
     reports: int = db.Column(db.Integer, default=0, nullable=False)
+    # Allow identical conversations to be answered from the response cache
+    cache_responses: bool = db.Column(db.Boolean, default=True, nullable=False)
     # Linking to the latest version
     latest_version_id = db.Column(
         db.Integer, db.ForeignKey("chatbot_versions.id"), nullable=True
     )
+    # Joined eagerly: every listing serializes the latest version, so lazy
+    # loading would issue one extra query per chatbot
     latest_version = db.relationship(
-        "ChatbotVersion", backref="chatbot", foreign_keys=[latest_version_id]
+        "ChatbotVersion",
+        backref="chatbot",
+        foreign_keys=[latest_version_id],
+        lazy="joined",
     )
 
     def create_version(self, name, new_prompt, modified_by):
@@ -82,6 +96,7 @@ class Chatbot(db.Model):
             "likes": self.likes,
             "avatar": self.avatar,  # Include avatar in the dictionary
             "reports": self.reports,
+            "cache_responses": self.cache_responses,
             "latest_version": (
                 self.latest_version.to_dict() if self.latest_version else None
             ),
@@ -90,6 +105,13 @@ class Chatbot(db.Model):
 
 class ChatbotVersion(db.Model):
     __tablename__ = "chatbot_versions"
+    __table_args__ = (
+        db.Index(
+            "ix_chatbot_versions_chatbot_id_version_number",
+            "chatbot_id",
+            "version_number",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     chatbot_id = db.Column(db.Integer, db.ForeignKey("chatbots.id"), nullable=False)
@@ -115,6 +137,10 @@ class ChatbotVersion(db.Model):
 
 class Chat(db.Model):
     __tablename__ = "chats"
+    # History is read per conversation in id order, often from a given id on
+    __table_args__ = (
+        db.Index("ix_chats_chatbot_id_user_id_id", "chatbot_id", "user_id", "id"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     chatbot_id: int = db.Column(db.Integer, nullable=False)
@@ -135,8 +161,40 @@ class Chat(db.Model):
         }
 
 
+class ConversationSummary(db.Model):
+    __tablename__ = "conversation_summaries"
+    __table_args__ = (db.UniqueConstraint("chatbot_id", "user_id"),)
+
+    id: int = db.Column(db.Integer, primary_key=True)
+    chatbot_id: int = db.Column(db.Integer, nullable=False)
+    user_id: int = db.Column(db.Integer, nullable=False)
+    summary: str = db.Column(db.Text, nullable=False, default="")
+    # Id of the newest chat folded into the summary
+    last_chat_id: int = db.Column(db.Integer, nullable=False, default=0)
+    turns_summarized: int = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "chatbot_id": self.chatbot_id,
+            "user_id": self.user_id,
+            "summary": self.summary,
+            "last_chat_id": self.last_chat_id,
+            "turns_summarized": self.turns_summarized,
+        }
+
+
 class Image(db.Model):
     __tablename__ = "images"
+    __table_args__ = (
+        db.Index("ix_images_user_id_id", "user_id", "id"),
+        db.Index("ix_images_public_id", "public", "id"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     prompt: str = db.Column(db.Text, nullable=False)
@@ -162,7 +220,7 @@ class Comment(db.Model):
     id: int = db.Column(db.Integer, primary_key=True)
     name: str = db.Column(db.Text, nullable=False)
     message: str = db.Column(db.Text, nullable=False)
-    chatbot_id: int = db.Column(db.Integer, nullable=False)
+    chatbot_id: int = db.Column(db.Integer, nullable=False, index=True)
     likes: int = db.Column(db.Integer, default=0, nullable=False)
     reports: int = db.Column(db.Integer, default=0, nullable=False)
 
@@ -175,3 +233,50 @@ class Comment(db.Model):
             "likes": self.likes,
             "reports": self.reports,
         }
+
+
+class Job(db.Model):
+    """A unit of background work (OCR, captioning, TTS, handwriting PDF)."""
+
+    __tablename__ = "jobs"
+    # Workers claim the highest priority, oldest queued job first
+    __table_args__ = (
+        db.Index(
+            "ix_jobs_status_priority_created_at", "status", "priority", "created_at"
+        ),
+        db.Index("ix_jobs_user_id_status", "user_id", "status"),
+    )
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    id: str = db.Column(db.String(32), primary_key=True)
+    kind: str = db.Column(db.String(32), nullable=False)
+    user_id: int = db.Column(db.Integer, nullable=False)
+    priority: int = db.Column(db.Integer, nullable=False, default=0)
+    status: str = db.Column(db.String(16), nullable=False, default=QUEUED)
+    # JSON parameters and optional binary input (e.g. an uploaded image)
+    params: str = db.Column(db.Text, nullable=False, default="{}")
+    input = db.Column(db.LargeBinary, nullable=True)
+    result = db.Column(db.LargeBinary, nullable=True)
+    result_mimetype: str = db.Column(db.String(64), nullable=True)
+    error: str = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
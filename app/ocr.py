@@ -0,0 +1,184 @@
+import io
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from PIL import Image, ImageOps, ImageSequence
+
+from .constants import (
+    OCR_MAX_PAGES,
+    OCR_MAX_QUEUE,
+    OCR_MAX_SIDE,
+    OCR_MIN_SIDE,
+    OCR_TARGET_DPI,
+    OCR_TIMEOUT,
+    OCR_WORKERS,
+)
+from .lazy_imports import lazy_import
+
+logger = logging.getLogger(__name__)
+
+pytesseract = lazy_import("pytesseract")
+
+
+class OCRBusyError(RuntimeError):
+    """Raised when too many OCR jobs are already queued."""
+
+
+class OCRTimeoutError(RuntimeError):
+    """Raised when an image takes longer than ``OCR_TIMEOUT`` to read."""
+
+
+class OCRFailedError(RuntimeError):
+    """Raised when tesseract fails to read an image."""
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload is bigger than the allowed size."""
+
+
+def read_upload(file, max_bytes: int) -> bytes:
+    """Read an uploaded file into memory, refusing it past ``max_bytes``."""
+    data = file.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise UploadTooLargeError(f"File {file.filename} is too large.")
+    return data
+
+
+def normalize_image(image: Image.Image) -> Image.Image:
+    """Grayscale the image and scale it to roughly ``OCR_TARGET_DPI``.
+
+    Tesseract is most accurate around 300 DPI. Images that declare a lower
+    DPI (or are simply small) are upscaled, and huge ones are shrunk so one
+    upload cannot tie a worker up for minutes.
+    """
+    image = ImageOps.exif_transpose(image).convert("L")
+    longest = max(image.size)
+    dpi = image.info.get("dpi", (0, 0))[0]
+    scale = OCR_TARGET_DPI / dpi if dpi and dpi < OCR_TARGET_DPI else 1.0
+    if longest * scale < OCR_MIN_SIDE:
+        scale = OCR_MIN_SIDE / longest
+    scale = min(scale, OCR_MAX_SIDE / longest)
+    if abs(scale - 1.0) > 0.05:
+        width = max(1, round(image.width * scale))
+        height = max(1, round(image.height * scale))
+        image = image.resize((width, height), Image.LANCZOS)
+    return image
+
+
+def ocr_bytes(data: bytes, deadline: Optional[float] = None) -> str:
+    """Read the text of an encoded image; up to ``OCR_MAX_PAGES`` pages.
+
+    Runs in the worker processes, so it only takes and returns plain values.
+    ``deadline`` is a ``time.time()`` by which every page must be read; each
+    page gets tesseract's timeout from what is left of it.
+    """
+    pages = []
+    with Image.open(io.BytesIO(data)) as image:
+        for frame in itertools.islice(ImageSequence.Iterator(image), OCR_MAX_PAGES):
+            timeout = OCR_TIMEOUT
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    raise OCRTimeoutError("OCR took too long.")
+            try:
+                pages.append(
+                    pytesseract.image_to_string(
+                        normalize_image(frame),
+                        config=f"--dpi {OCR_TARGET_DPI}",
+                        timeout=timeout,
+                    )
+                )
+            except Exception as e:
+                if deadline is not None and time.time() >= deadline:
+                    raise OCRTimeoutError("OCR took too long.") from None
+                # pytesseract's errors do not survive pickling back to the parent
+                raise OCRFailedError(f"{type(e).__name__}: {e}") from None
+    return "\n".join(page.strip() for page in pages)
+
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(OCR_MAX_QUEUE)
+_stats = {"images": 0, "timeouts": 0, "rejected": 0}
+
+
+def _get_pool() -> Executor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned, not forked: the web process runs background threads
+                _pool = ProcessPoolExecutor(
+                    max_workers=OCR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _reset_pool(broken: Executor) -> None:
+    """Drop a pool whose worker died so the next request starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+def ocr_images(images: List[bytes]) -> List[str]:
+    """OCR several encoded images in parallel, in the worker pool.
+
+    Raises OCRBusyError when the queue is full and OCRTimeoutError when the
+    whole batch is not done within ``OCR_TIMEOUT``. A queue slot is only
+    freed once its image is no longer queued or running, even after the
+    request has given up on it.
+    """
+    acquired = 0
+    for _ in images:
+        if not _slots.acquire(blocking=False):
+            for _ in range(acquired):
+                _slots.release()
+            _stats["rejected"] += 1
+            raise OCRBusyError("Too many OCR requests in progress.")
+        acquired += 1
+
+    futures = []
+    try:
+        pool = _get_pool()
+        deadline = time.time() + OCR_TIMEOUT
+        for data in images:
+            future = pool.submit(ocr_bytes, data, deadline)
+            future.add_done_callback(lambda _: _slots.release())
+            futures.append(future)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        for _ in range(acquired - len(futures)):
+            _slots.release()
+        raise
+
+    try:
+        texts = [
+            future.result(timeout=max(0, deadline - time.time()))
+            for future in futures
+        ]
+    except (FutureTimeoutError, OCRTimeoutError):
+        for future in futures:
+            future.cancel()
+        _stats["timeouts"] += 1
+        raise OCRTimeoutError("OCR took too long.")
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise OCRFailedError("An OCR worker crashed; please retry.")
+    _stats["images"] += len(images)
+    return texts
+
+
+def stats() -> Dict[str, Any]:
+    return {"workers": OCR_WORKERS, "max_queue": OCR_MAX_QUEUE, **_stats}
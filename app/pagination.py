@@ -0,0 +1,57 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[int]:
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError.
+
+    Cursors only ever hold integer ids and scores, so anything else is
+    rejected here rather than failing later in a comparison.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(values, list) or not all(
+        isinstance(value, int) and not isinstance(value, bool) for value in values
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def page_size(limit: Optional[str]) -> int:
+    """Parse a ``limit`` query parameter, clamped to ``MAX_PAGE_SIZE``."""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    try:
+        return max(1, min(int(limit), MAX_PAGE_SIZE))
+    except ValueError:
+        raise ValueError(f"Invalid limit: {limit}")
+
+
+def paginate_by_id(
+    query, model, limit: int, after: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of ``query`` newest first, plus the next page's cursor.
+
+    Pages are cut with ``id < last seen id`` rather than OFFSET, so each page
+    costs the same however deep the client scrolls.
+    """
+    if after:
+        (last_id,) = decode_cursor(after)
+        query = query.filter(model.id < last_id)
+    rows = query.order_by(model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
+
@@ -0,0 +1,73 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class ClientCache:
+    """Bounded LRU cache of LLM provider SDK clients.
+
+    Clients are keyed by ``(engine, sha256(api key))`` so the raw key is never
+    kept as a dictionary key, and so repeated messages from the same user
+    reuse the client's keep-alive HTTP connection pool.
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        self.max_size = max(1, max_size)
+        self._factories: Dict[str, Callable[[str], Any]] = {}
+        self._clients: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register(self, engine: str, factory: Callable[[str], Any]) -> None:
+        self._factories[engine] = factory
+
+    def get(self, engine: str, api_key: str) -> Any:
+        key = (engine, hash_api_key(api_key))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            self.misses += 1
+
+        client = self._factories[engine](api_key)
+
+        with self._lock:
+            # Another thread may have built the same client in the meantime
+            existing = self._clients.get(key)
+            if existing is not None:
+                self._clients.move_to_end(key)
+                return existing
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                evicted_key, _ = self._clients.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Evicted {evicted_key[0]} client from cache")
+        return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            }
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .constants import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    ENGINE_TIMEOUTS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+)
+from .metrics import HistogramFamily
+
+logger = logging.getLogger(__name__)
+
+# Successful call latency per engine
+engine_latency = HistogramFamily()
+
+
+class EngineUnavailableError(RuntimeError):
+    """Raised when no engine could answer: all failed, timed out or are open."""
+
+
+class CircuitBreaker:
+    """Fast-fail calls to an engine after repeated consecutive failures.
+
+    After ``failure_threshold`` failures in a row the breaker opens and calls
+    are rejected for ``reset_timeout`` seconds. Then a single trial call is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                return True
+            if self.state == self.HALF_OPEN:
+                # Only the trial call may pass until it reports back
+                self.rejected += 1
+                return False
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self) -> None:
+        """End a call that gave no verdict, e.g. one that was cancelled.
+
+        A trial call that ends this way re-opens the breaker, so the next
+        trial is let through after another ``reset_timeout``.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def is_caller_error(error: Exception) -> bool:
+    """True for provider 4xx errors such as a bad API key or request.
+
+    These say nothing about the engine's health, so they neither trip the
+    breaker nor trigger failover.
+    """
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+def breaker_for(engine: str) -> CircuitBreaker:
+    breaker = _breakers.get(engine)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                engine,
+                CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT),
+            )
+    return breaker
+
+
+def engine_timeout(engine: str) -> float:
+    return ENGINE_TIMEOUTS.get(engine, ENGINE_TIMEOUTS["default"])
+
+
+def hedge_delay(engine: str) -> Optional[float]:
+    """Seconds to wait on ``engine`` before hedging, or None to not hedge."""
+    if HEDGE_PERCENTILE <= 0:
+        return None
+    histogram = engine_latency.get(engine)
+    if histogram.count < HEDGE_MIN_SAMPLES:
+        return None
+    return histogram.percentile(HEDGE_PERCENTILE) / 1000
+
+
+def guarded_call(engine: str, call: Callable[[], Any]) -> Any:
+    """Run a synchronous engine call through its breaker and latency metrics."""
+    breaker = breaker_for(engine)
+    if not breaker.allow():
+        raise EngineUnavailableError(f"Engine {engine} is temporarily unavailable.")
+    start = time.perf_counter()
+    try:
+        result = call()
+    except Exception as e:
+        if is_caller_error(e):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    engine_latency.observe(engine, time.perf_counter() - start)
+    return result
+
+
+async def guarded_call_async(engine: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Await an engine call with its timeout, breaker and latency metrics."""
+    breaker = breaker_for(engine)
+    if not breaker.allow():
+        raise EngineUnavailableError(f"Engine {engine} is temporarily unavailable.")
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(call(), timeout=engine_timeout(engine))
+    except Exception as e:
+        if is_caller_error(e):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled, e.g. lost a hedge race; says nothing about the engine's
+        # health, but a half-open trial must not stay outstanding forever
+        breaker.release()
+        raise
+    breaker.record_success()
+    engine_latency.observe(engine, time.perf_counter() - start)
+    return result
+
+
+async def call_with_failover(
+    candidates: List[Tuple[str, Callable[[], Awaitable[Any]]]],
+) -> Any:
+    """Try ``(engine, call)`` candidates in order until one succeeds.
+
+    When the first engine has enough latency history and is still running
+    after its ``HEDGE_PERCENTILE`` latency, the next candidate is started in
+    parallel and whichever answers first wins.
+    """
+    errors: List[str] = []
+    index = 0
+    while index < len(candidates):
+        engine, call = candidates[index]
+        index += 1
+        task = asyncio.ensure_future(guarded_call_async(engine, call))
+        tasks = {task: engine}
+
+        delay = hedge_delay(engine) if index < len(candidates) else None
+        if delay is not None:
+            done, _ = await asyncio.wait({task}, timeout=delay)
+            if not done:
+                hedge_engine, hedge_call = candidates[index]
+                index += 1
+                logger.info(f"Hedging slow {engine} request with {hedge_engine}.")
+                hedge = asyncio.ensure_future(
+                    guarded_call_async(hedge_engine, hedge_call)
+                )
+                tasks[hedge] = hedge_engine
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for finished in done:
+                error = finished.exception()
+                if error is None or is_caller_error(error):
+                    for loser in pending:
+                        loser.cancel()
+                    return finished.result()
+                errors.append(f"{tasks[finished]}: {error!r}")
+                logger.warning(f"Engine {tasks[finished]} failed: {error!r}")
+
+    raise EngineUnavailableError("All engines failed: " + "; ".join(errors))
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "latency": engine_latency.snapshot(),
+        "breakers": {engine: b.stats() for engine, b in list(_breakers.items())},
+    }
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL,
+)
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached responses.
+
+    The default is an in-process store; a shared backend (e.g. Redis or a
+    database table) only needs to implement ``get``, ``set`` and ``clear``.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryBackend(CacheBackend):
+    """Size-bounded LRU store whose entries expire after their TTL."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+            }
+
+
+def normalize_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Collapse whitespace, and letter case in user messages, before hashing."""
+    normalized = []
+    for message in messages:
+        content = re.sub(r"\s+", " ", message["content"] or "").strip()
+        if message["role"] == "user":
+            content = content.casefold()
+        normalized.append({"role": message["role"], "content": content})
+    return normalized
+
+
+class ResponseCache:
+    """Opt-in cache of chatbot replies for identical conversations."""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 3600,
+        enabled: bool = False,
+    ) -> None:
+        self.backend = backend or InMemoryBackend()
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def make_key(
+        engine: str,
+        model: Optional[str],
+        version_id: Optional[int],
+        messages: List[Dict[str, str]],
+    ) -> str:
+        payload = json.dumps(
+            [engine, model, version_id, normalize_messages(messages)],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if value:
+            self.backend.set(key, value, self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            **self.backend.stats(),
+        }
+
+
+response_cache = ResponseCache(
+    InMemoryBackend(RESPONSE_CACHE_MAX_ENTRIES),
+    ttl=RESPONSE_CACHE_TTL,
+    enabled=RESPONSE_CACHE_ENABLED,
+)
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running get the same future instead of starting their own call.
+    Once the call finishes the key is forgotten, so later calls run again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def submit(self, key: str, start: Callable[[], Future]) -> Tuple[Future, bool]:
+        """Return the in-flight future for ``key``, starting it if needed.
+
+        The boolean is True when this caller started the call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = start()
+            self._calls[key] = future
+            self.leaders += 1
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future, True
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once for all concurrent callers with the same key."""
+        pending: Future = Future()
+        future, leader = self.submit(key, lambda: pending)
+        if leader:
+            try:
+                pending.set_result(fn())
+            except BaseException as e:
+                # Followers would otherwise wait forever on e.g. a SystemExit
+                pending.set_exception(e)
+                raise
+        return future.result()
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "shared": self.shared,
+            }
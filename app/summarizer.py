@@ -0,0 +1,145 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+
+from . import ai
+from .constants import SUMMARY_EVERY_TURNS
+from .models import Chat, ConversationSummary
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an "
+    "assistant. Merge the new turns into the current summary. Keep facts, "
+    "names, preferences and open questions; drop small talk. Reply with the "
+    "updated summary only, in at most 200 words."
+)
+
+# (previous_summary, [(user_query, response), ...], engine, apiKey) -> new summary
+Summarizer = Callable[[str, List[Tuple[str, str]], str, str], str]
+
+
+def llm_summarizer(
+    previous: str, turns: List[Tuple[str, str]], engine: str, apiKey: str
+) -> str:
+    """Summarize with the same engine and API key the conversation uses."""
+    transcript = "\n".join(
+        f"User: {user_query}\nAssistant: {response}" for user_query, response in turns
+    )
+    messages = [
+        {"role": "system", "content": SUMMARY_PROMPT},
+        {
+            "role": "user",
+            "content": f"Current summary:\n{previous or '(none)'}\n\n"
+            f"New turns:\n{transcript}",
+        },
+    ]
+    return ai.chat_with_chatbot(messages, apiKey, engine)
+
+
+_summarizer: Summarizer = llm_summarizer
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summarizer")
+# A fixed set of locks striped by conversation, so memory does not grow with
+# every conversation seen. Two conversations sharing a stripe only postpone
+# one update to that conversation's next message.
+_LOCK_STRIPES = 64
+_locks: List[threading.Lock] = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+
+def set_summarizer(summarizer: Summarizer) -> None:
+    """Swap the summarizer, e.g. for a local stub in tests."""
+    global _summarizer
+    _summarizer = summarizer
+
+
+def get_summary(chatbot_id: int, user_id: int) -> Optional[ConversationSummary]:
+    return ConversationSummary.query.filter_by(
+        chatbot_id=chatbot_id, user_id=user_id
+    ).first()
+
+
+def summary_messages(summary: Optional[ConversationSummary]) -> List[Dict[str, str]]:
+    if summary is None or not summary.summary:
+        return []
+    return [
+        {
+            "role": "system",
+            "content": f"Summary of the earlier conversation: {summary.summary}",
+        }
+    ]
+
+
+def _lock_for(chatbot_id: int, user_id: int) -> threading.Lock:
+    return _locks[hash((chatbot_id, user_id)) % _LOCK_STRIPES]
+
+
+def update_summary(db, chatbot_id: int, user_id: int, engine: str, apiKey: str) -> bool:
+    """Fold the oldest unsummarized turns into the summary every K turns.
+
+    At least K recent turns always stay verbatim, so a conversation is sent as
+    summary + up to 2K - 1 turns. Returns True if the summary changed.
+    """
+    k = SUMMARY_EVERY_TURNS
+    if k <= 0:
+        return False
+    lock = _lock_for(chatbot_id, user_id)
+    if not lock.acquire(blocking=False):
+        return False  # another update of this conversation is running
+    try:
+        summary = get_summary(chatbot_id, user_id)
+        after_chat_id = summary.last_chat_id if summary else 0
+        pending: List[Chat] = (
+            Chat.query.filter(
+                Chat.chatbot_id == chatbot_id,
+                Chat.user_id == user_id,
+                Chat.id > after_chat_id,
+            )
+            .order_by(Chat.id)
+            .limit(2 * k)
+            .all()
+        )
+        if len(pending) < 2 * k:
+            return False
+
+        folded = pending[:k]
+        new_text = _summarizer(
+            summary.summary if summary else "",
+            [(chat.user_query, chat.response) for chat in folded],
+            engine,
+            apiKey,
+        )
+        if summary is None:
+            summary = ConversationSummary(
+                chatbot_id=chatbot_id, user_id=user_id, turns_summarized=0
+            )
+            db.session.add(summary)
+        summary.summary = new_text
+        summary.last_chat_id = folded[-1].id
+        summary.turns_summarized += len(folded)
+        db.session.commit()
+        logger.info(
+            f"Summarized {len(folded)} turns for chatbot {chatbot_id}, "
+            f"user {user_id} ({summary.turns_summarized} in total)."
+        )
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error updating conversation summary: {e}")
+        return False
+    finally:
+        lock.release()
+
+
+def schedule_summary_update(
+    app: Flask, db, chatbot_id: int, user_id: int, engine: str, apiKey: str
+) -> None:
+    """Run ``update_summary`` in the background so replies are not delayed."""
+
+    def run() -> None:
+        with app.app_context():
+            update_summary(db, chatbot_id, user_id, engine, apiKey)
+
+    _executor.submit(run)
@@ -0,0 +1,215 @@
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from .constants import (
+    MOCK_ENGINE_ENABLED,
+    TTS_CACHE_DIR,
+    TTS_CACHE_MAX_BYTES,
+    TTS_CHUNK_CHARS,
+    TTS_WORKERS,
+)
+from .lazy_imports import lazy_import
+from .mock_engine import synthesize_mock_speech
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+gtts = lazy_import("gtts")
+
+# (plain text, language) -> MP3 bytes
+Synthesizer = Callable[[str, str], bytes]
+
+
+def gtts_synthesizer(text: str, lang: str) -> bytes:
+    buffer = io.BytesIO()
+    gtts.gTTS(text=text, lang=lang).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def mock_synthesizer(text: str, lang: str) -> bytes:
+    return synthesize_mock_speech(text)
+
+
+class AudioCache:
+    """Size-bounded on-disk store of synthesized audio, keyed by content hash.
+
+    Files are named after the SHA-256 of the language and plain text, so the
+    same reply read aloud by many users is synthesized once. When the total
+    size passes ``max_bytes`` the least recently read files are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str, lang: str) -> str:
+        return hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _ensure_loaded(self) -> None:
+        """Index files left by earlier runs, oldest access first."""
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".mp3"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_atime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total += size
+        self._loaded = True
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(key)
+            self.hits += 1
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+            return data
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._sizes.pop(key, 0)
+            return None
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        # Write under a temporary name so readers never see a partial file
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            self._ensure_loaded()
+            self._total += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                old_key, size = self._sizes.popitem(last=False)
+                self._total -= size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._sizes),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+audio_cache = AudioCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+_synthesizer: Synthesizer = (
+    mock_synthesizer if MOCK_ENGINE_ENABLED else gtts_synthesizer
+)
+_in_flight = SingleFlight()
+_pool = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def set_synthesizer(synthesizer: Synthesizer) -> None:
+    """Swap the speech backend, e.g. for a local stub in tests."""
+    global _synthesizer
+    _synthesizer = synthesizer
+
+
+def synthesize(text: str, lang: str = "en") -> bytes:
+    """MP3 bytes for ``text``, synthesized at most once per distinct text."""
+    key = audio_cache.key(text, lang)
+    data = audio_cache.get(key)
+    if data is not None:
+        return data
+
+    def run() -> bytes:
+        data = _synthesizer(text, lang)
+        try:
+            audio_cache.set(key, data)
+        except OSError as e:
+            logger.error(f"Failed to cache synthesized audio: {e}")
+        return data
+
+    # Concurrent requests for the same text wait for one synthesis
+    return _in_flight.do(key, run)
+
+
+def split_sentences(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of whole sentences of up to ``max_chars``.
+
+    The first chunk is always just the first sentence so playback can start
+    as early as possible; a single sentence longer than ``max_chars`` is
+    kept whole.
+    """
+    sentences = [s.strip() for s in _SENTENCE_END.split(text) if s and s.strip()]
+    chunks: List[str] = []
+    current = ""
+    for sentence in sentences:
+        if not chunks and not current:
+            chunks.append(sentence)
+        elif current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def synthesize_stream(chunks: List[str], lang: str = "en") -> Iterator[bytes]:
+    """Yield the audio of each chunk in order, synthesizing ahead in a pool.
+
+    Only a few chunks run ahead of the one being sent, so a client that
+    disconnects early does not leave the whole text being synthesized.
+    """
+    pending: Deque[Future] = deque()
+    remaining = iter(chunks)
+    try:
+        for chunk in remaining:
+            pending.append(_pool.submit(synthesize, chunk, lang))
+            if len(pending) >= TTS_WORKERS:
+                break
+        while pending:
+            data = pending.popleft().result()
+            next_chunk = next(remaining, None)
+            if next_chunk is not None:
+                pending.append(_pool.submit(synthesize, next_chunk, lang))
+            yield data
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def stats() -> Dict[str, Any]:
+    return {"cache": audio_cache.stats(), "in_flight": _in_flight.stats()}
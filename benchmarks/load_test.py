@@ -0,0 +1,205 @@
+"""End-to-end latency and throughput of the API against the local mock engine.
+
+Starts the app on a local port with ``MOCK_ENGINE_ENABLED`` set, seeds a
+scratch database, then fires concurrent HTTP requests at each scenario and
+prints p50/p95/p99 latency and requests per second. No provider is called:
+chat goes to the "mock" engine and TTS to mock speech synthesis.
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --scenarios chat,data --requests 500 \\
+        --concurrency 32 --latency-ms 500 --tokens-per-second 50
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ["chat", "chat_stream", "data", "like", "tts"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=100)
+    parser.add_argument("--reply-tokens", type=int, default=50)
+    parser.add_argument("--chats", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--chatbots", type=int, default=5_000)
+    parser.add_argument("--images", type=int, default=50_000)
+    parser.add_argument("--comments", type=int, default=20_000)
+    return parser.parse_args()
+
+
+def request(
+    method: str, url: str, headers: Dict[str, str], body: Optional[dict] = None
+) -> int:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers=headers)
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(req) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run_scenario(
+    send: Callable[[int], int], total: int, concurrency: int
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            status = send(i)
+        except Exception:
+            status = 599
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+    else:
+        cuts = latencies * 99
+    return {
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "rps": total / wall,
+        "errors": errors,
+    }
+
+
+def scenarios(
+    base: str, headers: Dict[str, str], chatbot_id: int
+) -> Dict[str, Callable[[int], int]]:
+    chat_headers = {**headers, "apikey": "mock", "engine": "mock"}
+    return {
+        # Distinct queries, so the response cache does not answer them
+        "chat": lambda i: request(
+            "POST",
+            f"{base}/api/chatbot/{chatbot_id}",
+            chat_headers,
+            {"query": f"benchmark question number {i}"},
+        ),
+        "chat_stream": lambda i: request(
+            "POST",
+            f"{base}/api/chatbot/{chatbot_id}?stream=1",
+            chat_headers,
+            {"query": f"streamed benchmark question number {i}"},
+        ),
+        "data": lambda i: request(
+            "GET",
+            f"{base}/api/data?queues=my_bots,public_bots,public_images,leaderboard",
+            headers,
+        ),
+        "like": lambda i: request(
+            "POST", f"{base}/api/actions/chatbot/{chatbot_id}/like", headers
+        ),
+        "tts": lambda i: request(
+            "POST",
+            f"{base}/api/tts",
+            headers,
+            {"text": f"Reading benchmark answer number {i} out loud."},
+        ),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    fd, scratch = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{scratch}",
+            "SEED_ON_STARTUP": "0",
+            "MOCK_ENGINE_ENABLED": "1",
+            "MOCK_ENGINE_LATENCY_MS": str(args.latency_ms),
+            "MOCK_ENGINE_TOKENS_PER_SECOND": str(args.tokens_per_second),
+            "MOCK_ENGINE_REPLY_TOKENS": str(args.reply_tokens),
+        }
+    )
+
+    from flask_jwt_extended import create_access_token
+    from werkzeug.serving import make_server
+
+    from app import create_app, db
+    from app.models import Chatbot
+    from query_plans import seed
+
+    app = create_app()
+    try:
+        with app.app_context():
+            db.create_all()
+            seed(db, args)
+            user_id = 1
+            chatbot = Chatbot.query.filter_by(user_id=user_id).first()
+            if chatbot is None:
+                chatbot = Chatbot(avatar="a", user_id=user_id, public=False)
+                db.session.add(chatbot)
+                db.session.commit()
+                chatbot.create_version("bench", "You are a benchmark bot.", "user")
+            chatbot_id = chatbot.id
+            token = create_access_token(identity=str(user_id))
+            db.session.remove()
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        headers = {"Authorization": f"Bearer {token}"}
+        available = scenarios(base, headers, chatbot_id)
+
+        print(
+            f"{args.requests} requests per scenario, concurrency {args.concurrency}, "
+            f"mock engine {args.latency_ms:.0f} ms + {args.reply_tokens} tokens "
+            f"at {args.tokens_per_second:.0f}/s"
+        )
+        print(
+            f"{'scenario':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'req/s':>9} {'errors':>7}"
+        )
+        for name in args.scenarios.split(","):
+            if name not in available:
+                print(f"Unknown scenario: {name}")
+                continue
+            result = run_scenario(available[name], args.requests, args.concurrency)
+            print(
+                f"{name:<12} {result['p50']:>9.1f} {result['p95']:>9.1f} "
+                f"{result['p99']:>9.1f} {result['rps']:>9.1f} {result['errors']:>7}"
+            )
+        server.shutdown()
+    finally:
+        os.remove(scratch)
+
+
+if __name__ == "__main__":
+    main()
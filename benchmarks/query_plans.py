@@ -0,0 +1,286 @@
+"""Query plans and latency of the hot endpoint queries, with and without indexes.
+
+Seeds a scratch database (1M chats by default), then for every query below
+prints its plan and median latency first with the indexes declared in
+``app/models.py`` dropped and then with them created.
+
+    python benchmarks/query_plans.py
+    python benchmarks/query_plans.py --chats 100000 --database sqlite:////tmp/bench.db
+
+The database is deleted afterwards unless ``--database`` is given.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--chatbots", type=int, default=5_000)
+    parser.add_argument("--images", type=int, default=50_000)
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database", help="SQLAlchemy URL of a scratch database")
+    return parser.parse_args()
+
+
+def seed(db, args: argparse.Namespace) -> None:
+    from sqlalchemy import insert
+    from app.models import Chat, Chatbot, ChatbotVersion, Comment, Image, User
+
+    rng = random.Random(0)
+
+    def insert_rows(model, rows: List[Dict], chunk: int = 20_000) -> None:
+        for start in range(0, len(rows), chunk):
+            db.session.execute(insert(model), rows[start : start + chunk])
+        db.session.commit()
+
+    insert_rows(
+        User,
+        [
+            {
+                "id": i,
+                "name": f"user{i}",
+                "avatar": "a",
+                "bio": "b",
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": "x",
+                "likes": 0,
+                "reports": 0,
+                "contribution_score": rng.randint(0, 5_000),
+            }
+            for i in range(1, args.users + 1)
+        ],
+    )
+    insert_rows(
+        Chatbot,
+        [
+            {
+                "id": i,
+                "avatar": "a",
+                "user_id": rng.randint(1, args.users),
+                "public": rng.random() < 0.3,
+                "category": "General",
+                "likes": 0,
+                "reports": 0,
+                "cache_responses": True,
+                "latest_version_id": i,
+            }
+            for i in range(1, args.chatbots + 1)
+        ],
+    )
+    insert_rows(
+        ChatbotVersion,
+        [
+            {
+                "id": i,
+                "chatbot_id": i,
+                "version_number": 1,
+                "prompt": "p",
+                "name": f"bot{i}",
+                "modified_by": "user",
+            }
+            for i in range(1, args.chatbots + 1)
+        ],
+    )
+    insert_rows(
+        Image,
+        [
+            {
+                "prompt": "p",
+                "user_id": rng.randint(1, args.users),
+                "public": rng.random() < 0.5,
+                "likes": 0,
+                "reports": 0,
+            }
+            for _ in range(args.images)
+        ],
+    )
+    insert_rows(
+        Comment,
+        [
+            {
+                "name": "n",
+                "message": "m",
+                "chatbot_id": rng.randint(1, args.chatbots),
+                "likes": 0,
+                "reports": 0,
+            }
+            for _ in range(args.comments)
+        ],
+    )
+    chunk = 50_000
+    for start in range(0, args.chats, chunk):
+        rows = [
+            {
+                "chatbot_id": rng.randint(1, args.chatbots),
+                "user_id": rng.randint(1, args.users),
+                "user_query": "hello",
+                "response": "hi there",
+            }
+            for _ in range(min(chunk, args.chats - start))
+        ]
+        db.session.execute(insert(Chat), rows)
+        db.session.commit()
+
+
+def endpoint_queries(db) -> List[Tuple[str, Callable]]:
+    """(name, query factory) for the queries behind each hot endpoint."""
+    from app.constants import DEFAULT_PAGE_SIZE, HISTORY_MAX_TURNS
+    from app.models import Chat, Chatbot, ChatbotVersion, Comment, Image, User
+
+    # Any existing conversation, for the per-conversation queries
+    chatbot_id, user_id = (
+        db.session.query(Chat.chatbot_id, Chat.user_id)
+        .order_by(Chat.id.desc())
+        .first()
+    )
+    return [
+        (
+            "POST /api/chatbot/<id> (history window)",
+            lambda: Chat.query.filter(
+                Chat.chatbot_id == chatbot_id, Chat.user_id == user_id
+            )
+            .order_by(Chat.id.desc())
+            .limit(HISTORY_MAX_TURNS),
+        ),
+        (
+            "DELETE /api/chats/<id> (conversation rows)",
+            lambda: Chat.query.filter_by(chatbot_id=chatbot_id, user_id=user_id),
+        ),
+        (
+            "GET /api/data my_bots",
+            lambda: Chatbot.query.filter(Chatbot.user_id == user_id)
+            .order_by(Chatbot.id.desc())
+            .limit(DEFAULT_PAGE_SIZE + 1),
+        ),
+        (
+            "GET /api/data public_bots",
+            lambda: Chatbot.query.filter_by(public=True)
+            .order_by(Chatbot.id.desc())
+            .limit(DEFAULT_PAGE_SIZE + 1),
+        ),
+        (
+            "GET /api/data my_images",
+            lambda: Image.query.filter(Image.user_id == user_id)
+            .order_by(Image.id.desc())
+            .limit(DEFAULT_PAGE_SIZE + 1),
+        ),
+        (
+            "GET /api/data public_images",
+            lambda: Image.query.filter_by(public=True)
+            .order_by(Image.id.desc())
+            .limit(DEFAULT_PAGE_SIZE + 1),
+        ),
+        (
+            "GET /api/chatbot_data/<id> versions",
+            lambda: ChatbotVersion.query.filter_by(chatbot_id=chatbot_id).order_by(
+                ChatbotVersion.version_number.desc()
+            ),
+        ),
+        (
+            "GET /api/chatbot_data/<id> comments",
+            lambda: Comment.query.filter_by(chatbot_id=chatbot_id),
+        ),
+        (
+            "GET /api/user/<username> chatbot count",
+            lambda: db.session.query(db.func.count(Chatbot.id)).filter(
+                Chatbot.user_id == user_id
+            ),
+        ),
+        (
+            "GET /api/leaderboard (top users)",
+            lambda: User.query.order_by(
+                User.contribution_score.desc(), User.id.desc()
+            ).limit(DEFAULT_PAGE_SIZE),
+        ),
+    ]
+
+
+def explain(db, query) -> str:
+    sql = str(
+        query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    )
+    prefix = "EXPLAIN QUERY PLAN " if db.engine.dialect.name == "sqlite" else "EXPLAIN "
+    rows = db.session.execute(db.text(prefix + sql)).fetchall()
+    return "\n".join("    " + " | ".join(str(col) for col in row) for row in rows)
+
+
+def measure(db, queries, repeat: int) -> Dict[str, float]:
+    results = {}
+    for name, make_query in queries:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            make_query().all()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(timings)
+        print(f"  {name}: {results[name]:.3f} ms\n{explain(db, make_query())}")
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    scratch = None
+    if args.database is None:
+        fd, scratch = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        args.database = f"sqlite:///{scratch}"
+    os.environ["DATABASE_URL"] = args.database
+    os.environ["SEED_ON_STARTUP"] = "0"
+
+    from app import create_app, db
+
+    app = create_app()
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            start = time.perf_counter()
+            seed(db, args)
+            print(f"Seeded {args.chats} chats in {time.perf_counter() - start:.1f}s")
+
+            indexes = [
+                index
+                for table in db.metadata.sorted_tables
+                for index in table.indexes
+            ]
+            queries = endpoint_queries(db)
+
+            for index in indexes:
+                index.drop(db.engine)
+            print("\nWithout indexes:")
+            before = measure(db, queries, args.repeat)
+
+            for index in indexes:
+                index.create(db.engine)
+            db.session.execute(db.text("ANALYZE"))
+            print("\nWith indexes:")
+            after = measure(db, queries, args.repeat)
+
+            print(f"\n{'query':<46} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+            for name, _ in queries:
+                speedup = before[name] / after[name] if after[name] else float("inf")
+                print(
+                    f"{name:<46} {before[name]:>10.3f} {after[name]:>10.3f} "
+                    f"{speedup:>7.1f}x"
+                )
+            db.session.remove()
+    finally:
+        if scratch:
+            os.remove(scratch)
+
+
+if __name__ == "__main__":
+    main()
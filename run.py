@@ -1,7 +1,14 @@
 from app import create_app
+from app.jobs import job_queue
 from flask import Flask
-
-flask_app: Flask = create_app()
+from werkzeug.serving import is_running_from_reloader
 
 if __name__ == "__main__":
+    # Only here: spawned OCR workers import this file as __mp_main__ and must
+    # not build (and warm up) an app of their own
+    flask_app: Flask = create_app()
+    # Only the reloader's child serves requests. Starting the workers now also
+    # runs jobs left queued by a previous process without waiting for a submit
+    if is_running_from_reloader() and job_queue.workers > 0:
+        job_queue.start(flask_app)
     flask_app.run("0.0.0.0", debug=True)
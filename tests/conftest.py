@@ -1,17 +1,20 @@
 import pytest
 from app import create_app, db
 from app.models import User
+from app.leaderboard import leaderboard
 
 
 @pytest.fixture
 def app():
     app = create_app()
     app.config["TESTING"] = True
+    app.config["SEED_ON_STARTUP"] = False
     with app.app_context():
         db.create_all()
         yield app
         db.session.remove()
         db.drop_all()
+        leaderboard.invalidate()
 
 
 @pytest.fixture
@@ -22,3 +25,53 @@ def client(app):
 @pytest.fixture
 def runner(app):
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def user(app):
+    user = User(
+        name="Test User",
+        username="tester",
+        email="tester@example.com",
+        password="not-a-real-hash",
+        avatar="https://ui-avatars.com/api/Test User",
+        bio="I am Bot maker",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    from flask_jwt_extended import create_access_token
+
+    token = create_access_token(identity=str(user.id))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def assert_max_queries(app):
+    """Fail if the block issues more than ``limit`` SQL statements."""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+
+    @contextmanager
+    def check(limit):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return check
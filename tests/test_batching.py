@@ -0,0 +1,57 @@
+import threading
+
+from app.batching import MicroBatcher
+
+
+def test_concurrent_items_share_a_batch():
+    batches = []
+
+    def run_batch(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_latency_ms=200)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda i=i: results.update({i: batcher(i)}))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+    assert len(batches) == 1
+    assert batcher.stats()["largest_batch"] == 4
+
+
+def test_batch_errors_reach_every_caller():
+    def run_batch(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(run_batch, max_batch_size=2, max_latency_ms=0)
+    future = batcher.submit("image")
+
+    try:
+        future.result(timeout=1)
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected the batch error")
+
+
+def test_items_without_a_result_fail_instead_of_hanging():
+    def run_batch(items):
+        return [item * 2 for item in items[:1]]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=2, max_latency_ms=200)
+    first, second = batcher.submit(1), batcher.submit(2)
+
+    assert first.result(timeout=1) == 2
+    try:
+        second.result(timeout=1)
+    except RuntimeError as e:
+        assert "returned 1 results for 2 items" in str(e)
+    else:
+        raise AssertionError("expected the missing result to fail")
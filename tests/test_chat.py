@@ -0,0 +1,97 @@
+import json
+
+from app import ai, db
+from app.models import Chat, Chatbot
+
+
+def fake_streamer(messages, apiKey):
+    yield "Hello"
+    yield ", world"
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: ") :], json.loads(data[len("data: ") :])))
+    return events
+
+
+def test_chatbot_streams_tokens_and_saves_chat(client, user, auth_headers, monkeypatch):
+    monkeypatch.setitem(ai.STREAMERS, "fake", fake_streamer)
+    chatbot = Chatbot(avatar="a", user_id=user.id, public=False)
+    db.session.add(chatbot)
+    db.session.flush()
+    chatbot.create_version(name="bot", new_prompt="Be nice", modified_by="tester")
+
+    response = client.post(
+        f"/api/chatbot/{chatbot.id}?stream=1",
+        json={"query": "hi"},
+        headers={**auth_headers, "apikey": "key", "engine": "fake"},
+    )
+
+    assert response.mimetype == "text/event-stream"
+    events = parse_events(response.get_data(as_text=True))
+    assert [data["token"] for name, data in events if name == "token"] == [
+        "Hello",
+        ", world",
+    ]
+    name, done = events[-1]
+    assert name == "done"
+    assert done["response"] == "Hello, world"
+    assert done["time_to_first_token_ms"] <= done["total_ms"]
+    assert Chat.query.filter_by(chatbot_id=chatbot.id).one().response == "Hello, world"
+
+
+def test_anonymous_chat_uses_async_engine(client, monkeypatch):
+    from app import ai_async
+
+    async def fake_engine(messages, apiKey):
+        return f"echo: {messages[-1]['content']}"
+
+    monkeypatch.setitem(ai_async.ASYNC_ENGINES, "fake", fake_engine)
+
+    response = client.post(
+        "/api/anonymous",
+        json={"query": "hi", "prev": []},
+        headers={"apikey": "key", "engine": "fake"},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["response"] == "echo: hi"
+
+
+def test_identical_requests_are_not_shared_across_api_keys(monkeypatch):
+    import asyncio
+
+    from app import ai_async
+
+    class AuthError(Exception):
+        status_code = 401
+
+    calls = []
+
+    async def fake_engine(messages, apiKey):
+        calls.append(apiKey)
+        await asyncio.sleep(0.05)
+        if apiKey == "bad":
+            raise AuthError("invalid api key")
+        return f"answer for {apiKey}"
+
+    monkeypatch.setitem(ai_async.ASYNC_ENGINES, "fake", fake_engine)
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def ask(apiKey):
+        return await ai_async.chat_with_chatbot_async(
+            messages, apiKey, "fake", dedupe_key="same-conversation"
+        )
+
+    async def main():
+        return await asyncio.gather(
+            ask("bad"), ask("good"), ask("good"), return_exceptions=True
+        )
+
+    bad, good, shared = asyncio.run(main())
+    assert isinstance(bad, AuthError)
+    assert good == shared == "answer for good"
+    assert sorted(calls) == ["bad", "good"]
@@ -0,0 +1,44 @@
+from app import db
+from app.counters import CounterBuffer
+from app.models import Image
+
+
+def test_like_is_a_single_atomic_update(client, user, assert_max_queries):
+    image = Image(prompt="p", user_id=user.id, public=True)
+    db.session.add(image)
+    db.session.commit()
+    image_id = image.id
+
+    with assert_max_queries(1) as statements:
+        response = client.post(f"/api/actions/image/{image_id}/like")
+    assert response.status_code == 200
+    assert statements[0].startswith("UPDATE images SET likes=(images.likes +")
+
+    client.post(f"/api/actions/image/{image_id}/like")
+    client.post(f"/api/actions/image/{image_id}/report")
+    image = db.session.get(Image, image_id)
+    db.session.refresh(image)
+    assert (image.likes, image.reports) == (2, 1)
+
+    assert client.post("/api/actions/image/999/like").status_code == 404
+
+
+def test_buffer_aggregates_and_flushes_in_one_batch(app, user):
+    images = [Image(prompt=f"p{i}", user_id=user.id) for i in range(2)]
+    db.session.add_all(images)
+    db.session.commit()
+    first, second = (image.id for image in images)
+
+    buffer = CounterBuffer(flush_interval=3600)
+    for _ in range(3):
+        buffer.add(Image, first, "likes")
+    buffer.add(Image, second, "likes")
+    buffer.add(Image, second, "reports")
+    assert buffer.pending(Image, first, "likes") == 3
+
+    assert buffer.flush() == 3
+    db.session.expire_all()
+    assert db.session.get(Image, first).likes == 3
+    second_image = db.session.get(Image, second)
+    assert (second_image.likes, second_image.reports) == (1, 1)
+    assert buffer.stats()["pending_rows"] == 0
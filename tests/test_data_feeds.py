@@ -0,0 +1,103 @@
+from app import db
+from app.models import Chatbot, Image, User
+from app.pagination import encode_cursor
+
+
+def test_public_images_are_paginated_with_cursors(client, user, auth_headers):
+    for i in range(5):
+        db.session.add(Image(prompt=f"p{i}", user_id=user.id, public=True))
+    db.session.commit()
+
+    seen = []
+    url = "/api/data?queues=public_images&limit=2"
+    after = None
+    while True:
+        response = client.get(url + (f"&after={after}" if after else ""), headers=auth_headers)
+        body = response.get_json()
+        seen += [image["prompt"] for image in body["public_images"]]
+        after = body["next_cursors"]["public_images"]
+        if after is None:
+            break
+
+    assert seen == ["p4", "p3", "p2", "p1", "p0"]
+
+
+def test_leaderboard_is_paginated_by_score(client, user, auth_headers):
+    for i, score in enumerate([10, 30, 30, 20]):
+        db.session.add(
+            User(
+                name=f"u{i}",
+                username=f"u{i}",
+                email=f"u{i}@example.com",
+                password="x",
+                avatar="a",
+                bio="b",
+                contribution_score=score,
+            )
+        )
+    db.session.commit()
+
+    first = client.get("/api/data?queues=leaderboard&limit=2", headers=auth_headers)
+    cursor = first.get_json()["next_cursors"]["leaderboard"]
+    second = client.get(
+        f"/api/data?queues=leaderboard&limit=2&after_leaderboard={cursor}",
+        headers=auth_headers,
+    )
+
+    names = [u["username"] for u in first.get_json()["leaderboard"]]
+    names += [u["username"] for u in second.get_json()["leaderboard"]]
+    assert names == ["u2", "u1", "u3", "u0"]
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers):
+    response = client.get("/api/data?queues=my_bots&after=nope", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_cursors_with_non_integer_values_are_rejected(client, auth_headers):
+    for query in (
+        f"queues=my_bots&after={encode_cursor({'a': 1})}",
+        f"queues=leaderboard&after_leaderboard={encode_cursor('x', 'y')}",
+    ):
+        response = client.get(f"/api/data?{query}", headers=auth_headers)
+        assert response.status_code == 400, query
+
+
+def add_bots(user, count, public=True):
+    for i in range(count):
+        chatbot = Chatbot(avatar="a", user_id=user.id, public=public)
+        db.session.add(chatbot)
+        db.session.flush()
+        chatbot.create_version(name=f"bot{i}", new_prompt="p", modified_by="tester")
+
+
+def test_chatbot_listings_do_not_load_versions_one_by_one(
+    client, user, auth_headers, assert_max_queries
+):
+    add_bots(user, 10)
+    url = f"/api/data?queues=my_bots,public_bots,user_bots,trend_today&uid={user.id}"
+
+    with assert_max_queries(8):
+        response = client.get(url, headers=auth_headers)
+
+    body = response.get_json()
+    assert len(body["public_bots"]) == 10
+    assert all(bot["latest_version"] for bot in body["my_bots"])
+
+
+def test_trend_of_the_day_is_stable(client, user, auth_headers, assert_max_queries):
+    from app import data_fetcher
+
+    data_fetcher._trend_cache.clear()
+    add_bots(user, 5)
+    for i in range(5):
+        db.session.add(Image(prompt=f"p{i}", user_id=user.id, public=True))
+    db.session.commit()
+
+    first = client.get("/api/data?queues=trend_today", headers=auth_headers)
+    with assert_max_queries(2) as statements:
+        second = client.get("/api/data?queues=trend_today", headers=auth_headers)
+
+    assert first.get_json()["trend_today"] == second.get_json()["trend_today"]
+    assert first.get_json()["trend_today"]["chatbot"] is not None
+    assert not any("random" in statement.lower() for statement in statements)
@@ -0,0 +1,54 @@
+from app import handwriting
+
+
+def test_wrap_words_packs_greedily():
+    lines = handwriting.wrap_words(
+        "aa bbb c dddddddddd ee".split(), len, space_width=1, max_width=8
+    )
+    assert lines == ["aa bbb c", "dddddddddd", "ee"]
+
+
+def test_width_table_matches_font_widths():
+    font = {"cw": [0] * 32 + [250] + [500] * 95, "desc": {"MissingWidth": 600}}
+    word_width = handwriting.width_table(font, font_size=10)
+    assert word_width("ab") == 10.0
+    assert word_width("a é") == 5.0 + 2.5 + 6.0
+
+
+def test_repeat_requests_are_served_from_cache(client, auth_headers, monkeypatch):
+    renders = []
+
+    def render(text, font_size):
+        renders.append((text, font_size))
+        return b"%PDF-" + text.encode()
+
+    monkeypatch.setattr(handwriting, "pdf_cache", handwriting.PDFCache(2))
+    monkeypatch.setattr(handwriting, "_render", render)
+    for font_size in (12, 12, 14):
+        response = client.post(
+            "/api/tth",
+            json={"text": "Dear diary", "font_size": font_size},
+            headers=auth_headers,
+        )
+        assert response.mimetype == "application/pdf"
+        assert response.data == b"%PDF-Dear diary"
+    assert renders == [("Dear diary", 12), ("Dear diary", 14)]
+    assert handwriting.pdf_cache.stats()["hits"] == 1
+
+
+def test_pdf_cache_evicts_and_can_be_disabled():
+    cache = handwriting.PDFCache(1)
+    cache.set("a", b"%PDF-a")
+    cache.set("b", b"%PDF-bb")
+    assert cache.get("a") is None and cache.get("b") == b"%PDF-bb"
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 7,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+    disabled = handwriting.PDFCache(0)
+    disabled.set("a", b"%PDF-a")
+    assert disabled.get("a") is None
@@ -0,0 +1,58 @@
+from app import db, history
+from app.models import Chat
+
+
+def test_window_keeps_most_recent_turns_within_budget(monkeypatch):
+    monkeypatch.setattr(history, "estimate_tokens", lambda text: len(text or ""))
+    monkeypatch.setitem(history.HISTORY_TOKEN_BUDGETS, "fake", 12)
+    turns = [("aa", "aa"), ("bb", "bb"), ("cc", "cc")]
+
+    window = history.window_turns([], turns, "q", "fake")
+
+    assert window.kept_turns == 2
+    assert window.dropped_turns == 1
+    assert [m["content"] for m in window.messages] == ["bb", "bb", "cc", "cc", "q"]
+
+
+def test_load_chat_history_reads_newest_rows(app, user, monkeypatch):
+    monkeypatch.setattr(history, "estimate_tokens", lambda text: len(text or ""))
+    monkeypatch.setitem(history.HISTORY_TOKEN_BUDGETS, "fake", 20)
+    monkeypatch.setattr(history, "HISTORY_MAX_TURNS", 3)
+    for i in range(5):
+        db.session.add(
+            Chat(chatbot_id=1, user_id=user.id, user_query=f"q{i}", response=f"r{i}")
+        )
+    db.session.commit()
+
+    system = [{"role": "system", "content": "sys"}]
+    window = history.load_chat_history(1, user.id, system, "now", "fake")
+
+    assert window.kept_turns == 3
+    assert window.dropped_turns == 2
+    assert window.messages[0] == system[0]
+    assert [m["content"] for m in window.messages[1:]] == [
+        "q2", "r2", "q3", "r3", "q4", "r4", "now"
+    ]
+
+
+def test_encoding_is_loaded_once_on_first_estimate(monkeypatch):
+    loads = []
+
+    class StubEncoding:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+    class StubTiktoken:
+        @staticmethod
+        def get_encoding(name):
+            loads.append(name)
+            return StubEncoding()
+
+    monkeypatch.setattr(history, "tiktoken", StubTiktoken)
+    monkeypatch.setattr(history, "_encoding", None)
+    monkeypatch.setattr(history, "_encoding_loaded", False)
+
+    assert loads == []
+    assert history.estimate_tokens("three small words") == 3
+    assert history.estimate_tokens("two words") == 2
+    assert loads == ["cl100k_base"]
@@ -0,0 +1,68 @@
+from app import db
+from app.identity import load_user, user_cache
+from app.models import User
+
+
+def user_selects(statements):
+    return [s for s in statements if s.startswith("SELECT") and "FROM users" in s]
+
+
+def test_user_is_loaded_once_per_request(app, user):
+    with app.test_request_context():
+        first = load_user(str(user.id))
+        assert load_user(user.id) is first
+    assert load_user("not-an-id") is None
+
+
+def test_process_cache_skips_the_lookup_until_the_user_changes(
+    app, client, user, auth_headers, assert_max_queries, monkeypatch
+):
+    monkeypatch.setattr(user_cache, "ttl", 60)
+    user_cache.clear()
+    user_id = user.id
+
+    client.get("/api/user_info", headers=auth_headers)
+    db.session.remove()
+    with assert_max_queries(10) as statements:
+        response = client.get("/api/user_info", headers=auth_headers)
+    assert response.get_json()["user"]["username"] == "tester"
+    assert user_selects(statements) == []
+
+    client.post(
+        "/api/profile/edit",
+        json={"username": "renamed", "name": "Renamed", "bio": "b"},
+        headers=auth_headers,
+    )
+    assert user_cache.get(user_id) is None
+    db.session.remove()
+    assert db.session.get(User, user_id).username == "renamed"
+    user_cache.clear()
+
+
+def test_score_awards_do_not_overwrite_other_workers(
+    app, client, user, auth_headers, monkeypatch
+):
+    from sqlalchemy import update
+
+    from app.models import Chatbot
+
+    monkeypatch.setattr(user_cache, "ttl", 60)
+    user_cache.clear()
+    user_id = user.id
+    chatbot = Chatbot(avatar="a", user_id=user_id, public=False)
+    db.session.add(chatbot)
+    db.session.commit()
+    chatbot_id = chatbot.id
+    client.get("/api/user_info", headers=auth_headers)
+
+    # Another process awards points; this process's cached row is now stale
+    db.session.execute(
+        update(User).where(User.id == user_id).values(contribution_score=10)
+    )
+    db.session.commit()
+    db.session.remove()
+
+    client.post(f"/api/publish/chatbot/{chatbot_id}", headers=auth_headers)
+    db.session.remove()
+    assert db.session.get(User, user_id).contribution_score == 12
+    user_cache.clear()
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+
+from app import create_app, db, tts
+from app.jobs import JobLimitError, _now, job_queue
+from app.models import Job
+
+
+@pytest.fixture
+def queue(app, monkeypatch):
+    # Jobs are run explicitly with run_once instead of by worker threads
+    monkeypatch.setattr(job_queue, "_ensure_workers", lambda: None)
+    monkeypatch.setitem(
+        job_queue._handlers, "echo", lambda params, data: (data, "text/plain")
+    )
+    return job_queue
+
+
+def test_async_tts_is_queued_and_polled(
+    client, auth_headers, queue, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(tts, "audio_cache", tts.AudioCache(str(tmp_path), 1024))
+    monkeypatch.setattr(tts, "_synthesizer", lambda text, lang: text.encode())
+
+    response = client.post(
+        "/api/tts?async=1", json={"text": "Hello. World."}, headers=auth_headers
+    )
+    assert response.status_code == 202
+    job_id = response.get_json()["job"]["id"]
+
+    pending = client.get(f"/api/jobs/{job_id}/result", headers=auth_headers)
+    assert pending.status_code == 409
+
+    assert queue.run_once()
+    status = client.get(f"/api/jobs/{job_id}", headers=auth_headers).get_json()
+    assert status["job"]["status"] == "done"
+    result = client.get(f"/api/jobs/{job_id}/result", headers=auth_headers)
+    assert result.mimetype == "audio/mpeg"
+    assert result.data == b"Hello.World."
+
+
+def test_priority_then_age_order(queue, user):
+    low = queue.submit("echo", user.id, data=b"low", priority=0)
+    high = queue.submit("echo", user.id, data=b"high", priority=5)
+    assert queue.claim() == high.id
+    assert queue.claim() == low.id
+
+
+def test_per_user_concurrency_and_queue_limits(queue, user, monkeypatch):
+    monkeypatch.setattr(queue, "user_concurrency", 1)
+    monkeypatch.setattr(queue, "user_max_queued", 2)
+    first = queue.submit("echo", user.id, data=b"1")
+    queue.submit("echo", user.id, data=b"2")
+    other = queue.submit("echo", user.id + 1, data=b"3")
+
+    assert queue.claim() == first.id
+    # The user's second job waits while the first runs
+    assert queue.claim() == other.id
+    assert queue.claim() is None
+    with pytest.raises(JobLimitError):
+        queue.submit("echo", user.id, data=b"4")
+
+
+def test_failures_and_expired_results(client, auth_headers, queue, user, monkeypatch):
+    def fail(params, data):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(queue._handlers, "fail", fail)
+    job_id = queue.submit("fail", user.id).id
+    assert queue.run_once()
+    response = client.get(f"/api/jobs/{job_id}/result", headers=auth_headers)
+    assert (response.status_code, response.get_json()["message"]) == (500, "boom")
+
+    db.session.get(Job, job_id).expires_at = _now() - timedelta(seconds=1)
+    db.session.commit()
+    queue.cleanup()
+    assert client.get(f"/api/jobs/{job_id}", headers=auth_headers).status_code == 404
+    assert queue.stats()["failed"] >= 1
+
+
+def test_workers_start_on_submit_but_not_with_the_app(app, user, monkeypatch):
+    started = []
+    monkeypatch.setattr(job_queue, "workers", 2)
+    monkeypatch.setattr(job_queue, "start", lambda app: started.append(app))
+    monkeypatch.setitem(
+        job_queue._handlers, "echo", lambda params, data: (data, "text/plain")
+    )
+    create_app()
+    assert started == []
+
+    # Nor in a multiprocessing child, such as a spawned OCR worker
+    monkeypatch.setattr("multiprocessing.parent_process", lambda: object())
+    job_queue.submit("echo", user.id)
+    assert started == []
+
+    monkeypatch.setattr("multiprocessing.parent_process", lambda: None)
+    job_queue.submit("echo", user.id)
+    assert started == [app]
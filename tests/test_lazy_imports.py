@@ -0,0 +1,18 @@
+import sys
+
+from app.lazy_imports import import_report, lazy_import
+
+
+def test_module_is_imported_on_first_attribute_access():
+    sys.modules.pop("colorsys", None)
+    colorsys = lazy_import("colorsys")
+    assert "colorsys" not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+    assert "colorsys" in sys.modules
+    entry = next(e for e in import_report() if e["module"] == "colorsys")
+    assert entry["loaded"] and entry["seconds"] >= 0
+
+
+def test_lazy_import_returns_one_proxy_per_module():
+    assert lazy_import("json") is lazy_import("json")
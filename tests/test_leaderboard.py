@@ -0,0 +1,66 @@
+from app import db
+from app.leaderboard import Leaderboard
+from app.models import User
+
+
+def add_users(scores):
+    users = []
+    for i, score in enumerate(scores):
+        user = User(
+            name=f"u{i}",
+            username=f"u{i}",
+            email=f"u{i}@example.com",
+            password="x",
+            avatar="a",
+            bio="b",
+            contribution_score=score,
+        )
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+    return users
+
+
+def test_top_and_rank_follow_updates(app):
+    users = add_users([10, 30, 20])
+    board = Leaderboard()
+
+    assert [e["username"] for e in board.top(2)] == ["u1", "u2"]
+    assert board.rank(users[0].id)["rank"] == 3
+
+    users[0].contribution_score = 40
+    db.session.commit()
+    board.update(users[0])
+
+    assert [e["username"] for e in board.top(3)] == ["u0", "u1", "u2"]
+    assert board.rank(users[2].id) == {**board.top(3)[2], "total": 3}
+    assert "email" not in board.top(1)[0]
+
+
+def test_reads_do_not_query_after_first_build(app, assert_max_queries):
+    user_id = add_users([5, 15])[0].id
+    board = Leaderboard()
+    board.top(1)
+
+    with assert_max_queries(0):
+        board.top(10)
+        board.rank(user_id)
+        board.page(1)
+
+
+def test_leaderboard_endpoints(client, user, auth_headers):
+    add_users([3, 7])
+
+    response = client.get("/api/leaderboard?k=2", headers=auth_headers)
+    assert [e["username"] for e in response.get_json()["leaderboard"]] == ["u1", "u0"]
+
+    client.post(
+        "/api/create_chatbot",
+        json={"name": "bot", "prompt": "p", "category": "c"},
+        headers=auth_headers,
+    )
+    response = client.get(f"/api/leaderboard/rank/{user.id}", headers=auth_headers)
+    assert response.get_json()["rank"]["rank"] == 2
+
+    response = client.get("/api/leaderboard/rank/999", headers=auth_headers)
+    assert response.status_code == 404
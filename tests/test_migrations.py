@@ -0,0 +1,51 @@
+import os
+
+from flask_migrate import upgrade
+from sqlalchemy import inspect, text
+
+from app import create_app, db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+INITIAL_REVISION = "c1047ed786fb"
+
+
+def migrated_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'migrated.db'}")
+    return create_app()
+
+
+def test_migrations_match_the_models(tmp_path, monkeypatch):
+    app = migrated_app(tmp_path, monkeypatch)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            migrated = {column["name"] for column in inspector.get_columns(table.name)}
+            assert {column.name for column in table.columns} == migrated, table.name
+            migrated = {index["name"] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= migrated, table.name
+        db.engine.dispose()
+
+
+def test_initial_schema_upgrades_existing_rows(tmp_path, monkeypatch):
+    # A database created before the migrations, then stamped as documented
+    app = migrated_app(tmp_path, monkeypatch)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS, revision=INITIAL_REVISION)
+        columns = {c["name"] for c in inspect(db.engine).get_columns("chatbots")}
+        assert "cache_responses" not in columns
+        with db.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT INTO chatbots (avatar, public, category, likes, reports)"
+                    " VALUES ('a', 1, 'General', 0, 0)"
+                )
+            )
+
+        upgrade(directory=MIGRATIONS)
+        with db.engine.connect() as connection:
+            cache_responses = connection.execute(
+                text("SELECT cache_responses FROM chatbots")
+            ).scalar_one()
+        assert cache_responses
+        db.engine.dispose()
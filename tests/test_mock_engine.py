@@ -0,0 +1,17 @@
+import asyncio
+
+from app import mock_engine
+
+
+def test_mock_engine_replies_at_the_configured_rate(monkeypatch):
+    monkeypatch.setattr(mock_engine, "MOCK_ENGINE_LATENCY_MS", 0)
+    monkeypatch.setattr(mock_engine, "MOCK_ENGINE_TOKENS_PER_SECOND", 0)
+    monkeypatch.setattr(mock_engine, "MOCK_ENGINE_REPLY_TOKENS", 4)
+    messages = [{"role": "user", "content": "hello there"}]
+
+    tokens = list(mock_engine.stream_mock(messages, "key"))
+    assert tokens == ["hello ", "there ", "hello ", "there "]
+    assert mock_engine.chat_with_mock(messages, "key") == "hello there hello there"
+    assert asyncio.run(mock_engine.achat_with_mock(messages, "key")) == (
+        "hello there hello there"
+    )
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from app.model_registry import ModelRegistry
+
+
+def test_model_loaded_once_across_threads():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry()
+    registry.register("dummy", loader)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("dummy")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = registry.stats()["dummy"]
+    assert stats["loaded"]
+    assert stats["load_time_s"] >= 0.05
+    assert stats["memory_bytes"] > 0
+
+
+def test_idle_models_are_evicted():
+    registry = ModelRegistry(idle_ttl=0.01)
+    registry.register("dummy", lambda: [1, 2, 3])
+    registry.get("dummy")
+    time.sleep(0.02)
+
+    assert registry.evict_idle() == ["dummy"]
+    assert not registry.is_loaded("dummy")
+    assert registry.stats()["dummy"]["loaded"] is False
@@ -0,0 +1,119 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app import ocr
+
+
+def png(size, dpi=None):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "white").save(
+        buffer, format="PNG", **({"dpi": dpi} if dpi else {})
+    )
+    return buffer.getvalue()
+
+
+class StubTesseract:
+    @staticmethod
+    def image_to_string(image, config="", timeout=0):
+        return f"{image.mode} {image.width}x{image.height}\n"
+
+
+@pytest.fixture
+def stub_ocr(monkeypatch):
+    # Run in threads so the stub is visible to the "workers"
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(ocr, "_pool", pool)
+    monkeypatch.setattr(ocr, "pytesseract", StubTesseract)
+    yield
+    pool.shutdown()
+
+
+def test_normalize_scales_towards_target_dpi():
+    low_dpi = Image.open(io.BytesIO(png((1200, 600), dpi=(150, 150))))
+    assert ocr.normalize_image(low_dpi).size == (2400, 1200)
+
+    tiny = Image.new("RGB", (100, 50))
+    assert ocr.normalize_image(tiny).size == (ocr.OCR_MIN_SIDE, 500)
+
+    huge = Image.new("RGB", (8000, 100))
+    normalized = ocr.normalize_image(huge)
+    assert normalized.mode == "L" and normalized.width == ocr.OCR_MAX_SIDE
+
+
+def test_ocr_reads_uploads_in_memory(client, auth_headers, stub_ocr):
+    response = client.post(
+        "/api/ocr",
+        data={"file": (io.BytesIO(png((2000, 1000))), "scan.png")},
+        headers=auth_headers,
+    )
+    assert response.get_json() == {"success": True, "text": "L 2000x1000"}
+
+    response = client.post(
+        "/api/ocr",
+        data={"file": (io.BytesIO(b"not an image"), "scan.png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_batch_keeps_file_order(client, auth_headers, stub_ocr):
+    files = [
+        (io.BytesIO(png((2000, 1000))), "a.png"),
+        (io.BytesIO(png((1500, 1000))), "b.png"),
+    ]
+    response = client.post(
+        "/api/ocr/batch", data={"files": files}, headers=auth_headers
+    )
+    assert response.get_json()["results"] == [
+        {"filename": "a.png", "text": "L 2000x1000"},
+        {"filename": "b.png", "text": "L 1500x1000"},
+    ]
+
+
+def test_timed_out_images_keep_their_queue_slot(monkeypatch, stub_ocr):
+    release = threading.Event()
+
+    class SlowTesseract(StubTesseract):
+        @staticmethod
+        def image_to_string(image, config="", timeout=0):
+            release.wait()
+            return "done"
+
+    monkeypatch.setattr(ocr, "pytesseract", SlowTesseract)
+    monkeypatch.setattr(ocr, "OCR_TIMEOUT", 0.05)
+    monkeypatch.setattr(ocr, "_slots", threading.BoundedSemaphore(1))
+
+    try:
+        with pytest.raises(ocr.OCRTimeoutError):
+            ocr.ocr_images([png((10, 10))])
+        # The image is still being read, so the queue is still full
+        with pytest.raises(ocr.OCRBusyError):
+            ocr.ocr_images([png((10, 10))])
+    finally:
+        release.set()
+    assert ocr._slots.acquire(timeout=1)
+
+
+def test_multi_page_images_are_capped(monkeypatch, stub_ocr):
+    monkeypatch.setattr(ocr, "OCR_MAX_PAGES", 2)
+    buffer = io.BytesIO()
+    pages = [Image.new("RGB", (1000, 1000), "white") for _ in range(3)]
+    pages[0].save(buffer, format="TIFF", save_all=True, append_images=pages[1:])
+
+    [text] = ocr.ocr_images([buffer.getvalue()])
+    assert len(text.splitlines()) == 2
+
+
+def test_real_worker_pool_round_trips(monkeypatch):
+    # A spawned process, so this also catches workers that fail to start
+    monkeypatch.setattr(ocr, "_pool", None)
+    pool = ocr._get_pool()
+    try:
+        future = pool.submit(ocr.normalize_image, Image.new("RGB", (100, 50)))
+        assert future.result(timeout=60).size == (ocr.OCR_MIN_SIDE, 500)
+    finally:
+        pool.shutdown()
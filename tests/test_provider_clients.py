@@ -0,0 +1,28 @@
+from app.provider_clients import ClientCache
+
+
+def test_clients_are_reused_per_engine_and_key():
+    cache = ClientCache(max_size=2)
+    cache.register("dummy", lambda api_key: object())
+
+    first = cache.get("dummy", "key-a")
+    assert cache.get("dummy", "key-a") is first
+    assert cache.get("dummy", "key-b") is not first
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_least_recently_used_client_is_evicted():
+    cache = ClientCache(max_size=2)
+    cache.register("dummy", lambda api_key: object())
+
+    a = cache.get("dummy", "a")
+    cache.get("dummy", "b")
+    cache.get("dummy", "a")
+    cache.get("dummy", "c")
+
+    assert cache.get("dummy", "a") is a
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
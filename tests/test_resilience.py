@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app import resilience
+from app.resilience import CircuitBreaker, EngineUnavailableError, call_with_failover
+
+
+def test_breaker_opens_after_consecutive_failures_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # reset_timeout elapsed: one trial call goes through
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failover_moves_to_next_engine(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+    async def failing():
+        raise ConnectionError("down")
+
+    async def healthy():
+        return "from fallback"
+
+    result = asyncio.run(
+        call_with_failover([("primary-test", failing), ("fallback-test", healthy)])
+    )
+    assert result == "from fallback"
+
+
+def test_open_breaker_fast_fails(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    breaker = resilience.breaker_for("broken-test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def never_called():
+        raise AssertionError("breaker should reject the call")
+
+    with pytest.raises(EngineUnavailableError):
+        asyncio.run(call_with_failover([("broken-test", never_called)]))
+
+
+def test_slow_primary_is_hedged(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "hedge_delay", lambda engine: 0.01)
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "slow"
+
+    async def fast():
+        return "hedge"
+
+    result = asyncio.run(call_with_failover([("slow-test", slow), ("fast-test", fast)]))
+    assert result == "hedge"
+
+
+def test_cancelled_half_open_trial_is_released(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "hedge_delay", lambda engine: 0.01)
+    breaker = resilience.breaker_for("trial-test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "slow"
+
+    async def fast():
+        return "hedge"
+
+    # The half-open trial loses the hedge race and is cancelled
+    result = asyncio.run(call_with_failover([("trial-test", slow), ("fast-test", fast)]))
+    assert result == "hedge"
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.opened_at -= breaker.reset_timeout
+    assert breaker.allow()
+
+
+def test_disconnected_stream_releases_half_open_trial(monkeypatch):
+    from app import ai
+
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setitem(ai.STREAMERS, "stream-test", lambda m, k: iter("abc"))
+    breaker = resilience.breaker_for("stream-test")
+    breaker.state, breaker.opened_at = CircuitBreaker.OPEN, 0.0
+
+    stream = ai.stream_chat_with_chatbot([], "key", "stream-test")
+    assert next(stream) == "a"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    stream.close()
+    assert breaker.state == CircuitBreaker.OPEN
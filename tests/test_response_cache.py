@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from app import ai_async, db
+from app.models import Chatbot
+from app.response_cache import CacheBackend, InMemoryBackend, ResponseCache, response_cache
+
+
+def test_key_ignores_whitespace_and_case_of_user_messages():
+    system = {"role": "system", "content": "Be nice"}
+    a = ResponseCache.make_key(
+        "groq", "m", 1, [system, {"role": "user", "content": "Hi  there "}]
+    )
+    b = ResponseCache.make_key(
+        "groq", "m", 1, [system, {"role": "user", "content": "hi there"}]
+    )
+    c = ResponseCache.make_key(
+        "groq", "m", 2, [system, {"role": "user", "content": "hi there"}]
+    )
+    assert a == b
+    assert a != c
+
+
+def test_in_memory_backend_expires_and_evicts():
+    backend = InMemoryBackend(max_entries=2)
+    backend.set("a", "1", ttl=60)
+    backend.set("b", "2", ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("b") is None
+
+    backend.set("c", "3", ttl=60)
+    backend.set("d", "4", ttl=60)
+    assert backend.get("a") is None
+    assert backend.stats()["evictions"] == 1
+
+
+def test_partial_backend_fails_when_created():
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_identical_first_messages_hit_the_cache(client, user, auth_headers, monkeypatch):
+    calls = []
+
+    async def fake_engine(messages, apiKey):
+        calls.append(messages)
+        return "Hello!"
+
+    monkeypatch.setitem(ai_async.ASYNC_ENGINES, "fake", fake_engine)
+    monkeypatch.setattr(response_cache, "enabled", True)
+    monkeypatch.setattr(response_cache, "backend", InMemoryBackend())
+    chatbot = Chatbot(avatar="a", user_id=user.id, public=True)
+    db.session.add(chatbot)
+    db.session.flush()
+    chatbot.create_version(name="bot", new_prompt="Be nice", modified_by="tester")
+    headers = {**auth_headers, "apikey": "key", "engine": "fake"}
+
+    first = client.post(f"/api/chatbot/{chatbot.id}", json={"query": "hi"}, headers=headers)
+    client.post(f"/api/chatbot/{chatbot.id}/clear", headers=auth_headers)
+    second = client.post(f"/api/chatbot/{chatbot.id}", json={"query": "Hi"}, headers=headers)
+
+    assert first.get_json()["cached"] is False
+    assert second.get_json()["cached"] is True
+    assert second.get_json()["response"] == "Hello!"
+    assert len(calls) == 1
@@ -1,5 +1,10 @@
+import os
+import runpy
+
 import pytest
 
+RUN_PY = os.path.join(os.path.dirname(os.path.dirname(__file__)), "run.py")
+
 
 def test_app_creation(app):
     assert app is not None
@@ -9,3 +14,11 @@ def test_app_creation(app):
 def test_home_route(client):
     response = client.get("/")
     assert response.status_code == 200
+
+
+def test_spawned_workers_do_not_build_the_app(monkeypatch):
+    # How a spawned OCR worker imports the main module
+    built = []
+    monkeypatch.setattr("app.create_app", lambda: built.append(1))
+    runpy.run_path(RUN_PY, run_name="__mp_main__")
+    assert built == []
@@ -0,0 +1,40 @@
+from app.models import Chatbot
+from app.constants import DEFAULT_CHATBOTS
+
+
+def test_seed_command_is_idempotent(runner):
+    result = runner.invoke(args=["seed"])
+    assert "Default chatbots created." in result.output
+    assert Chatbot.query.count() == len(DEFAULT_CHATBOTS)
+
+    result = runner.invoke(args=["seed"])
+    assert "nothing to seed" in result.output
+    assert Chatbot.query.count() == len(DEFAULT_CHATBOTS)
+
+
+def test_feed_requests_do_not_seed(client, auth_headers, assert_max_queries):
+    with assert_max_queries(1) as statements:
+        client.get("/api/data?queues=my_images", headers=auth_headers)
+    assert not any("count(" in statement.lower() for statement in statements)
+
+
+def test_first_request_seeds_and_failed_seeding_is_retried(app, client, monkeypatch):
+    from app import helpers
+
+    app.config["SEED_ON_STARTUP"] = True
+    monkeypatch.setattr(helpers, "_default_chatbots_seeded", False)
+    seed = helpers._seed_default_chatbots
+    calls = []
+
+    def flaky_seed(db):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no such table: chatbots")
+        return seed(db)
+
+    monkeypatch.setattr(helpers, "_seed_default_chatbots", flaky_seed)
+    for _ in range(3):
+        client.get("/api/leaderboard")
+
+    assert len(calls) == 2
+    assert Chatbot.query.count() == len(DEFAULT_CHATBOTS)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", slow_call)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(flights.do("k", slow_call)))
+        for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 3}
+
+
+def test_finished_calls_are_not_reused():
+    flights = SingleFlight()
+    assert flights.do("k", lambda: 1) == 1
+    assert flights.do("k", lambda: 2) == 2
+
+
+def test_base_exceptions_reach_followers_and_free_the_key():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def interrupted():
+        started.set()
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    errors = []
+
+    def follow():
+        try:
+            flights.do("k", interrupted)
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=follow, daemon=True)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=follow, daemon=True)
+    follower.start()
+    while flights.stats()["shared"] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join(5)
+
+    assert not follower.is_alive()
+    assert [type(e) for e in errors] == [KeyboardInterrupt] * 2
+    assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,44 @@
+from app import db, summarizer
+from app.models import Chat
+
+
+def stub_summarizer(previous, turns, engine, apiKey):
+    queries = " ".join(user_query for user_query, _ in turns)
+    return f"{previous} {queries}".strip()
+
+
+def test_oldest_turns_are_folded_every_k_turns(app, user, monkeypatch):
+    monkeypatch.setattr(summarizer, "SUMMARY_EVERY_TURNS", 2)
+    monkeypatch.setattr(summarizer, "_summarizer", stub_summarizer)
+
+    def add_chat(i):
+        db.session.add(
+            Chat(chatbot_id=1, user_id=user.id, user_query=f"q{i}", response="r")
+        )
+        db.session.commit()
+
+    for i in range(3):
+        add_chat(i)
+    assert not summarizer.update_summary(db, 1, user.id, "fake", "key")
+
+    add_chat(3)
+    assert summarizer.update_summary(db, 1, user.id, "fake", "key")
+    summary = summarizer.get_summary(1, user.id)
+    assert summary.summary == "q0 q1"
+    assert summary.turns_summarized == 2
+
+    add_chat(4)
+    add_chat(5)
+    assert summarizer.update_summary(db, 1, user.id, "fake", "key")
+    assert summarizer.get_summary(1, user.id).summary == "q0 q1 q2 q3"
+    assert summarizer.summary_messages(summary)[0]["role"] == "system"
+
+
+def test_locks_are_a_fixed_striped_set():
+    locks = {
+        id(summarizer._lock_for(chatbot_id, user_id))
+        for chatbot_id in range(50)
+        for user_id in range(50)
+    }
+    assert len(locks) <= summarizer._LOCK_STRIPES
+    assert summarizer._lock_for(3, 4) is summarizer._lock_for(3, 4)
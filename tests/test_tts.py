@@ -0,0 +1,90 @@
+import pytest
+
+from app import tts
+
+
+@pytest.fixture
+def synth_calls(tmp_path, monkeypatch):
+    calls = []
+
+    def stub(text, lang):
+        calls.append((text, lang))
+        return f"{lang}:{text}".encode("utf-8")
+
+    monkeypatch.setattr(tts, "audio_cache", tts.AudioCache(str(tmp_path), 1024))
+    monkeypatch.setattr(tts, "_synthesizer", stub)
+    return calls
+
+
+def test_repeat_texts_are_synthesized_once(synth_calls):
+    assert tts.synthesize("hello") == b"en:hello"
+    assert tts.synthesize("hello") == b"en:hello"
+    assert tts.synthesize("hello", "fr") == b"fr:hello"
+    assert synth_calls == [("hello", "en"), ("hello", "fr")]
+    assert tts.audio_cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_read(tmp_path):
+    cache = tts.AudioCache(str(tmp_path), max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.set("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.mp3", "c.mp3"]
+
+    # A new process picks up what is already on disk
+    assert tts.AudioCache(str(tmp_path), max_bytes=10).get("c") == b"cccc"
+
+
+def test_tts_endpoint_streams_cached_bytes(client, auth_headers, synth_calls):
+    for _ in range(2):
+        response = client.post(
+            "/api/tts", json={"text": "**Hi** there"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "audio/mpeg"
+        assert response.data == b"en:Hi there"
+    assert len(synth_calls) == 1
+
+
+def test_split_sentences_starts_with_one_sentence():
+    text = "First one. Second one! Third one?\nFourth one."
+    assert tts.split_sentences(text, max_chars=25) == [
+        "First one.",
+        "Second one! Third one?",
+        "Fourth one.",
+    ]
+
+
+def test_long_replies_stream_chunk_by_chunk(client, auth_headers, synth_calls):
+    response = client.post(
+        "/api/tts",
+        json={"text": "# Title\n\nOne. Two. " + "Three is longer. " * 30},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.is_streamed
+    # Synthesized in parallel, but sent in order
+    chunks = tts.split_sentences("Title\nOne. Two. " + "Three is longer. " * 30)
+    assert chunks[0] == "Title" and len(chunks) > 2
+    assert response.data == b"".join(f"en:{chunk}".encode() for chunk in chunks)
+    assert sorted(text for text, _ in synth_calls) == sorted(chunks)
+
+
+def test_failure_on_first_chunk_returns_an_error(
+    client, auth_headers, synth_calls, monkeypatch
+):
+    def failing(text, lang):
+        raise RuntimeError("gTTS is down")
+
+    monkeypatch.setattr(tts, "_synthesizer", failing)
+    response = client.post(
+        "/api/tts",
+        json={"text": "One. Two. " + "Three is longer. " * 30},
+        headers=auth_headers,
+    )
+    assert response.status_code == 500
+    assert response.get_json() == {"success": False, "message": "gTTS is down"}
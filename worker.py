@@ -0,0 +1,18 @@
+import logging
+import os
+
+from app import create_app
+from app.jobs import job_queue
+
+# Runs background jobs (OCR, captioning, TTS, handwriting PDFs) in their own
+# process. Start the API with JOB_WORKERS=0 so it only queues them.
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # The API process seeds; a worker only needs the tables to exist
+    os.environ.setdefault("SEED_ON_STARTUP", "0")
+    app = create_app()
+    threads = job_queue.start(app, max(1, job_queue.workers))
+    logging.info(f"Job worker running with {len(threads)} threads.")
+    for thread in threads:
+        thread.join()